@@ -1,11 +1,28 @@
-from .double_gyre import generate_double_gyre_flow
-from .moving_vortex import generate_moving_vortex
-from .simple_flow import generate_simple_flow
+from .double_gyre import generate_double_gyre_flow, iter_double_gyre_chunks
+from .moving_vortex import (generate_moving_vortex, generate_multi_vortex,
+                            iter_moving_vortex_chunks, iter_multi_vortex_chunks)
+from .simple_flow import generate_simple_flow, iter_simple_flow_chunks
 from .kolmogorov_flow import generate_cfd_kolmogorov_flow
+from .kolmogorov_sweep import parameter_grid, sweep_kolmogorov_flow, warm_kolmogorov_cache
+from .flow_cache import FlowCache
+from .snapshot_store import SnapshotStore
+from .cylinder_wake import generate_cylinder_wake, iter_cylinder_wake_chunks
 
 __all__ = [
     "generate_double_gyre_flow",
     "generate_moving_vortex",
+    "generate_multi_vortex",
     "generate_simple_flow",
-    "generate_cfd_kolmogorov_flow"
+    "generate_cfd_kolmogorov_flow",
+    "sweep_kolmogorov_flow",
+    "parameter_grid",
+    "warm_kolmogorov_cache",
+    "iter_double_gyre_chunks",
+    "iter_moving_vortex_chunks",
+    "iter_multi_vortex_chunks",
+    "iter_simple_flow_chunks",
+    "generate_cylinder_wake",
+    "iter_cylinder_wake_chunks",
+    "FlowCache",
+    "SnapshotStore"
 ]
\ No newline at end of file
@@ -0,0 +1,117 @@
+import queue, threading
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class BackgroundWriter:
+    """
+    Runs output callables on a single writer thread, in submission order.
+
+    The queue is bounded by `max_pending`: when the writer falls behind,
+    `submit` blocks instead of letting queued output grow without limit.
+    An exception raised by a job is re-raised in the solver thread by the
+    next `submit`, `flush` or `close`.
+
+    Example
+    -------
+    >>> with BackgroundWriter() as writer:
+    ...     writer.submit(np.savez_compressed, "snap.npz", u=u_copy)
+    """
+
+    def __init__(self, max_pending=2):
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="background-writer",
+                                        daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                self._queue.task_done()
+                return
+            future, fn, args, kwargs = job
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as exc:
+                future.set_exception(exc)
+                self._error = self._error or exc
+            finally:
+                self._queue.task_done()
+
+    def _raise(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Queue `fn(*args, **kwargs)`; the arguments must not change until it ran."""
+        self._raise()
+        future = Future()
+        self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def flush(self):
+        """Wait until every queued job has run."""
+        self._queue.join()
+        self._raise()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._raise()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class DoubleBuffer:
+    """
+    Two sets of (n_timesteps, nx, ny) snapshot buffers, one filled by the
+    solver while the other is handed to a `BackgroundWriter`.
+
+    `slot(k)` returns the arrays to write snapshot k of the current buffer
+    into (e.g. as `GridSampler.sample(u, out=...)`). `swap(n)` queues
+    `sink(*fields)` with the first n snapshots of the current buffer and
+    switches to the other one, waiting only if that one is still being
+    written.
+    """
+
+    def __init__(self, writer, sink, n_timesteps, shape, n_fields=2, dtype=np.float64,
+                 fill_value=np.nan):
+        self.writer = writer
+        self.sink = sink
+        self._buffers = [tuple(np.full((n_timesteps, *shape), fill_value, dtype=dtype)
+                               for _ in range(n_fields))
+                         for _ in range(2)]
+        self._in_flight = [None, None]
+        self._current = 0
+
+    @property
+    def fields(self):
+        """The buffers currently being filled."""
+        return self._buffers[self._current]
+
+    def slot(self, k):
+        return tuple(field[k] for field in self.fields)
+
+    def swap(self, n):
+        full = self._current
+        self._in_flight[full] = self.writer.submit(
+            self.sink, *(field[:n] for field in self._buffers[full]))
+        self._current = 1 - full
+        if self._in_flight[self._current] is not None:
+            self._in_flight[self._current].result()
+            self._in_flight[self._current] = None
+
+    def flush(self):
+        for future in self._in_flight:
+            if future is not None:
+                future.result()
+        self._in_flight = [None, None]
@@ -0,0 +1,31 @@
+
+# Upper bound on the number of grid values held by one block of scratch
+# arrays when a generator evaluates its kernel block by block in time.
+BLOCK_ELEMENTS = 1 << 22
+
+
+def time_chunks(n_timesteps, chunk_size):
+    """
+    Yield consecutive slices of at most `chunk_size` timesteps that together
+    cover range(n_timesteps).
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    for start in range(0, n_timesteps, chunk_size):
+        yield slice(start, min(start + chunk_size, n_timesteps))
+
+
+def block_size(nx, ny, max_elements=BLOCK_ELEMENTS):
+    """Number of (nx, ny) snapshots that fit into `max_elements` values."""
+    return max(1, max_elements // (nx * ny))
+
+
+def check_out(out, shape):
+    """Validate a preallocated (u_out, v_out) pair of `shape` and return it."""
+    u_out, v_out = out
+    if u_out.shape != shape or v_out.shape != shape:
+        raise ValueError(f"out arrays must have shape {shape}, "
+                         f"got {u_out.shape} and {v_out.shape}")
+    if v_out.dtype != u_out.dtype:
+        raise ValueError("out arrays must share a dtype")
+    return u_out, v_out
@@ -0,0 +1,162 @@
+import numpy as np
+from mpi4py import MPI
+from scipy.sparse import csr_matrix
+
+from dolfinx.geometry import bb_tree, compute_collisions_points, compute_colliding_cells
+
+
+class GridSampler:
+    """
+    Samples a vector-valued dolfinx Function on a uniform (nx, ny) grid.
+
+    Everything that only depends on the mesh and the grid is done once:
+    the cell containing every grid point, the points inside the mesh and
+    their scatter indices into the grid. Points inside the obstacle or
+    outside the mesh are NaN in the output.
+
+    Sampling is a sparse matrix-vector product with the DOF vector: the
+    interpolation matrix holds the basis functions of each point's cell
+    evaluated at the point, so no point location or basis tabulation happens
+    in the time loop. For elements whose DOFs need permutations (Lagrange
+    of degree > 2) it falls back to `Function.eval` on the precomputed
+    points and cells.
+
+    Grid points are ordered (i, j) with i along x, so the (nx, ny) output
+    of a timestep is written contiguously, e.g. straight into `u_field[t]`.
+
+    On a distributed mesh every grid point is owned by the lowest rank
+    whose cells contain it. Each rank only evaluates the points it owns,
+    and `sample` assembles the full grid on rank 0 with a single `Gatherv`
+    per snapshot; the other ranks get None. `mask`, `valid_index` and
+    `invalid_index` describe the global grid on every rank, while
+    `local_index`, `points` and `cells` refer to this rank's points.
+    """
+
+    def __init__(self, V, x_vals, y_vals, use_matrix=True, comm=None):
+        mesh = V.mesh
+        self.comm = comm = mesh.comm if comm is None else comm
+        self.shape = (len(x_vals), len(y_vals))
+        self.gdim = mesh.geometry.dim
+        X, Y = np.meshgrid(x_vals, y_vals, indexing="ij")
+        points = np.stack([X.ravel(), Y.ravel(), np.zeros(X.size)], axis=1)
+
+        tree = bb_tree(mesh, mesh.geometry.dim)
+        candidates = compute_collisions_points(tree, points)
+        colliding = compute_colliding_cells(mesh, candidates, points)
+
+        # first colliding cell of every point that has one
+        offsets = np.asarray(colliding.offsets)
+        found = np.diff(offsets) > 0
+        # points on partition boundaries are found by several ranks; the
+        # lowest one owns them
+        owner = np.where(found, comm.rank, comm.size).astype(np.int32)
+        if comm.size > 1:
+            comm.Allreduce(MPI.IN_PLACE, owner, op=MPI.MIN)
+        valid = owner < comm.size
+        mine = owner == comm.rank
+        self.mask = valid.reshape(self.shape)
+        self.valid_index = np.flatnonzero(valid)
+        self.invalid_index = np.flatnonzero(~valid)
+        self.local_index = np.flatnonzero(mine)
+        self.points = points[mine]
+        self.cells = np.asarray(colliding.array)[offsets[:-1][mine]].astype(np.int32)
+
+        # grid index of every row of the gathered (n_valid, gdim) values on rank 0
+        self._counts = comm.gather(len(self.local_index), root=0)
+        self._order = self.local_index
+        if comm.size > 1:
+            order = recvbuf = None
+            if comm.rank == 0:
+                order = np.empty(len(self.valid_index), dtype=np.int64)
+                recvbuf = (order, self._counts)
+            comm.Gatherv(self.local_index.astype(np.int64), recvbuf, root=0)
+            self._order = order
+
+        self.matrix = self._interpolation_matrix(V) if use_matrix else None
+
+    def _interpolation_matrix(self, V):
+        """
+        (gdim * n_local, len(u.x.array)) matrix whose rows are component-major:
+        row c * n_local + k gives component c at this rank's point k.
+        """
+        element = V.ufl_element()
+        scalar = element.sub_elements[0] if element.block_size > 1 else element
+        if not getattr(scalar, "dof_transformations_are_identity", False):
+            return None
+
+        mesh = V.mesh
+        gdim = mesh.geometry.dim
+        bs = V.dofmap.index_map_bs
+        cmap = mesh.geometry.cmap
+        x_geom = mesh.geometry.x[:, :gdim]
+        geom_dofs = mesh.geometry.dofmap
+
+        n_local = len(self.cells)
+        n_dofs = (V.dofmap.index_map.size_local + V.dofmap.index_map.num_ghosts) * bs
+        if n_local == 0:
+            # this rank owns no grid point but still takes part in the Gatherv
+            return csr_matrix((0, n_dofs), dtype=mesh.geometry.x.dtype)
+        order = np.argsort(self.cells, kind="stable")
+        rows, cols, vals = [], [], []
+        # points sharing a cell are pulled back and tabulated together
+        starts = np.flatnonzero(np.diff(self.cells[order], prepend=-1))
+        for block in np.split(order, starts[1:]):
+            cell = self.cells[block[0]]
+            X_ref = cmap.pull_back(self.points[block, :gdim], x_geom[geom_dofs[cell]])
+            phi = scalar.tabulate(0, X_ref)[0]                # (n_points, n_dofs)
+            dofs = V.dofmap.cell_dofs(cell)
+            for c in range(bs):
+                rows.append(np.repeat(c * n_local + block, len(dofs)))
+                cols.append(np.tile(dofs * bs + c, len(block)))
+                vals.append(phi.ravel())
+
+        return csr_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                          shape=(bs * n_local, n_dofs))
+
+    def allocate(self, n_timesteps, dtype=np.float64):
+        """NaN-filled (u_field, v_field) buffers of shape (n_timesteps, nx, ny)."""
+        return tuple(np.full((n_timesteps, *self.shape), np.nan, dtype=dtype)
+                     for _ in range(2))
+
+    def evaluate(self, u):
+        """Values at this rank's points, shape (gdim, n_local)."""
+        if len(self.cells) == 0:
+            return np.empty((self.gdim, 0), dtype=u.x.array.dtype)
+        if self.matrix is not None:
+            return (self.matrix @ u.x.array).reshape(-1, len(self.cells))
+        return u.eval(self.points, self.cells).T
+
+    def gather(self, values):
+        """
+        Collect the (gdim, n_local) values of every rank on rank 0 as
+        (n_valid, gdim), in the order of `_order`; None on other ranks.
+        """
+        if self.comm.size == 1:
+            return values.T
+        send = np.ascontiguousarray(values.T)
+        recv = recvbuf = None
+        if self.comm.rank == 0:
+            recv = np.empty((len(self.valid_index), send.shape[1]), dtype=send.dtype)
+            recvbuf = (recv, [n * send.shape[1] for n in self._counts])
+        self.comm.Gatherv(send, recvbuf, root=0)
+        return recv
+
+    def sample(self, u, out=None):
+        """
+        Sample `u` on the grid. Collective on a distributed mesh.
+
+        out : optional pair of (nx, ny) arrays, e.g. (u_field[t], v_field[t])
+            from `allocate`, only used on rank 0. Only the valid points are
+            written, so the invalid ones must already hold NaN.
+        Returns the (u, v) grids on rank 0 and None on the other ranks.
+        """
+        values = self.gather(self.evaluate(u))
+        if values is None:
+            return None
+        if out is None:
+            out = tuple(np.full(self.shape, np.nan) for _ in range(2))
+        for c, grid in enumerate(out):
+            if not grid.flags.c_contiguous:
+                raise ValueError("output grids must be C-contiguous (nx, ny) arrays")
+            grid.reshape(-1)[self._order] = values[:, c]
+        return out
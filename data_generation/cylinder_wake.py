@@ -0,0 +1,381 @@
+import os
+from pathlib import Path
+
+import numpy as np
+
+from .chunking import time_chunks
+from .flow_cache import CACHE_DIR, cache_key, get_cache
+
+_CACHE_VERSION = 2
+_MESH_VERSION = 1
+
+# DFG 2D-3 geometry: channel [0, L] x [0, H] with a cylinder of radius r at (c_x, c_y)
+L, H = 2.2, 0.41
+C_X = C_Y = 0.2
+R = 0.05
+MARKERS = dict(fluid=1, inlet=2, outlet=3, wall=4, obstacle=5)
+_FORCE_NAMES = ("t", "C_D", "C_L", "t_p", "p_diff")
+
+
+def _get_comm(comm):
+    if comm is None:
+        from mpi4py import MPI
+        comm = MPI.COMM_WORLD
+    return comm
+
+
+def _write_mesh(path: Path, res_min: float):
+    """Mesh the fluid domain with gmsh as in the DFG 2D-3 demo and write it to `path`."""
+    import gmsh
+
+    initialized = gmsh.isInitialized()
+    if not initialized:
+        gmsh.initialize()
+    gmsh.option.setNumber("General.Terminal", 0)
+    gmsh.model.add("cylinder_wake")
+    gdim = 2
+
+    rectangle = gmsh.model.occ.addRectangle(0, 0, 0, L, H, tag=1)
+    obstacle = gmsh.model.occ.addDisk(C_X, C_Y, 0, R, R)
+    gmsh.model.occ.cut([(gdim, rectangle)], [(gdim, obstacle)])
+    gmsh.model.occ.synchronize()
+
+    volumes = gmsh.model.getEntities(dim=gdim)
+    assert len(volumes) == 1
+    gmsh.model.addPhysicalGroup(volumes[0][0], [volumes[0][1]], MARKERS["fluid"])
+    gmsh.model.setPhysicalName(volumes[0][0], MARKERS["fluid"], "Fluid")
+
+    # tag the boundaries by their center of mass
+    inflow, outflow, walls, obstacle = [], [], [], []
+    for boundary in gmsh.model.getBoundary(volumes, oriented=False):
+        center_of_mass = gmsh.model.occ.getCenterOfMass(boundary[0], boundary[1])
+        if np.allclose(center_of_mass, [0, H / 2, 0]):
+            inflow.append(boundary[1])
+        elif np.allclose(center_of_mass, [L, H / 2, 0]):
+            outflow.append(boundary[1])
+        elif np.allclose(center_of_mass, [L / 2, H, 0]) or np.allclose(center_of_mass, [L / 2, 0, 0]):
+            walls.append(boundary[1])
+        else:
+            obstacle.append(boundary[1])
+    for name, entities in (("wall", walls), ("inlet", inflow), ("outlet", outflow),
+                           ("obstacle", obstacle)):
+        gmsh.model.addPhysicalGroup(1, entities, MARKERS[name])
+        gmsh.model.setPhysicalName(1, MARKERS[name], name.capitalize())
+
+    # refine towards the obstacle
+    distance_field = gmsh.model.mesh.field.add("Distance")
+    gmsh.model.mesh.field.setNumbers(distance_field, "EdgesList", obstacle)
+    threshold_field = gmsh.model.mesh.field.add("Threshold")
+    gmsh.model.mesh.field.setNumber(threshold_field, "IField", distance_field)
+    gmsh.model.mesh.field.setNumber(threshold_field, "LcMin", res_min)
+    gmsh.model.mesh.field.setNumber(threshold_field, "LcMax", 0.25 * H)
+    gmsh.model.mesh.field.setNumber(threshold_field, "DistMin", R)
+    gmsh.model.mesh.field.setNumber(threshold_field, "DistMax", 2 * H)
+    min_field = gmsh.model.mesh.field.add("Min")
+    gmsh.model.mesh.field.setNumbers(min_field, "FieldsList", [threshold_field])
+    gmsh.model.mesh.field.setAsBackgroundMesh(min_field)
+
+    # second order quadrilaterals, as in the benchmark
+    gmsh.option.setNumber("Mesh.Algorithm", 8)
+    gmsh.option.setNumber("Mesh.RecombinationAlgorithm", 2)
+    gmsh.option.setNumber("Mesh.RecombineAll", 1)
+    gmsh.option.setNumber("Mesh.SubdivisionAlgorithm", 1)
+    gmsh.model.mesh.generate(gdim)
+    gmsh.model.mesh.setOrder(2)
+    gmsh.model.mesh.optimize("Netgen")
+
+    tmp = path.with_name(f".tmp-{os.getpid()}-{path.name}")
+    gmsh.write(str(tmp))
+    os.replace(tmp, path)
+    gmsh.model.remove()
+    if not initialized:
+        gmsh.finalize()
+
+
+def load_cylinder_mesh(res_min=R / 3, comm=None, cache_dir=CACHE_DIR):
+    """
+    Mesh and facet markers of the DFG 2D-3 channel, distributed over `comm`.
+
+    The gmsh mesh is generated once on rank 0 and kept as a .msh file in the
+    flow cache directory; later calls only read it back.
+    """
+    from dolfinx.io import gmshio
+
+    comm = _get_comm(comm)
+    key = cache_key("cylinder_mesh", _MESH_VERSION, dict(L=L, H=H, c_x=C_X, c_y=C_Y,
+                                                         r=R, res_min=res_min))
+    path = get_cache(cache_dir).cache_dir / f"cylinder_mesh-{key}.msh"
+    if comm.rank == 0 and not path.exists():
+        _write_mesh(path, res_min)
+    comm.Barrier()
+    mesh, _, facet_tags = gmshio.read_from_msh(str(path), comm, 0, gdim=2)
+    return mesh, facet_tags
+
+
+def _force_forms(solver, facet_tags, U_mean):
+    """Drag and lift coefficient forms on the obstacle."""
+    from dolfinx.fem import form
+    from ufl import FacetNormal, Measure, as_vector, grad, inner
+
+    n = -FacetNormal(solver.mesh)  # Normal pointing out of obstacle
+    dObs = Measure("ds", domain=solver.mesh, subdomain_data=facet_tags,
+                   subdomain_id=MARKERS["obstacle"])
+    u_t = inner(as_vector((n[1], -n[0])), solver.u_)
+    mu, rho, p_ = solver.mu, solver.rho, solver.p_
+    scale = 2 / (U_mean**2 * 2 * R)
+    drag = form(scale * (mu / rho * inner(grad(u_t), n) * n[1] - p_ * n[0]) * dObs)
+    lift = form(-scale * (mu / rho * inner(grad(u_t), n) * n[0] + p_ * n[1]) * dObs)
+    return drag, lift
+
+
+def _pressure_probe(mesh, points):
+    """The first local cell holding each point (empty where this rank has none)."""
+    from dolfinx.geometry import bb_tree, compute_collisions_points, compute_colliding_cells
+
+    tree = bb_tree(mesh, mesh.geometry.dim)
+    colliding = compute_colliding_cells(mesh, compute_collisions_points(tree, points), points)
+    return [colliding.links(i)[:1] for i in range(len(points))]
+
+
+def _first_found(values):
+    """Per point, the value of the lowest rank that found it (rows are ranks)."""
+    values = np.asarray(values)
+    return values[np.isfinite(values).argmax(axis=0), np.arange(values.shape[1])]
+
+
+def _write_vtx(writers, t):
+    for writer in writers:
+        writer.write(t)
+
+
+def _iter_solution(n_timesteps, nx, ny, chunk_size, dt, mu, rho, U_max, save_every,
+                   res_min, dtype, comm, cache_dir, forces=None, forces_every=1,
+                   vtx_dir=None, vtx_every=50, sink=None):
+    """
+    Run the solver and yield `(t_slice, u_chunk, v_chunk)` snapshot blocks
+    (None on ranks other than 0).
+
+    With `sink`, rank 0 samples into a `DoubleBuffer` instead: after a block
+    is yielded, `sink(t_slice, u_chunk, v_chunk)` runs on the background
+    writer thread while the solver fills the other half, so a yielded block
+    is only valid until the next one is requested. VTX output always goes
+    through the writer thread, from copies of u and p.
+
+    Every `forces_every` solver steps, drag, lift and the pressure
+    difference across the cylinder are appended to `forces` on rank 0.
+    """
+    from dolfinx.fem import assemble_scalar
+    from .background_writer import BackgroundWriter, DoubleBuffer
+    from .cylinder_sampling import GridSampler
+    from .ipcs_solver import InletVelocity, IPCSSolver
+
+    mesh, facet_tags = load_cylinder_mesh(res_min, comm, cache_dir)
+    solver = IPCSSolver(mesh, facet_tags, MARKERS, dt=dt, mu=mu, rho=rho,
+                        inlet_velocity=InletVelocity(0.0, H=H, U_max=U_max))
+    sampler = GridSampler(solver.V, np.linspace(0, L, nx), np.linspace(0, H, ny), comm=comm)
+    drag, lift = _force_forms(solver, facet_tags, U_mean=2 * U_max / 3)
+    # pressure in front of and behind the cylinder, as in the benchmark
+    probe_points = np.array([[C_X - R, C_Y, 0.0], [C_X + R, C_Y, 0.0]])
+    probe_cells = _pressure_probe(mesh, probe_points)
+
+    writer = BackgroundWriter(max_pending=2)
+    buffers = None
+    if sink is not None and comm.rank == 0:
+        written = 0
+
+        def write_block(u_block, v_block):
+            # jobs run in submission order, so the blocks arrive in time order
+            nonlocal written
+            sink(slice(written, written + len(u_block)), u_block, v_block)
+            written += len(u_block)
+
+        buffers = DoubleBuffer(writer, write_block, min(chunk_size, n_timesteps),
+                               sampler.shape, dtype=dtype)
+
+    vtx, vtx_fields, vtx_comm, vtx_job = [], [], None, None
+    if vtx_dir is not None:
+        from dolfinx.fem import Function
+        from dolfinx.io import VTXWriter
+        # The writer thread writes copies of u and p while the solver keeps
+        # updating u_ and p_. The writes are collective, so they get their
+        # own communicator (mpi4py asks for MPI_THREAD_MULTIPLE by default).
+        vtx_comm = mesh.comm.Dup()
+        vtx_fields = [Function(f.function_space, name=f.name) for f in (solver.u_, solver.p_)]
+        vtx = [VTXWriter(vtx_comm, str(Path(vtx_dir) / f"cylinder-{f.name}.bp"), [f],
+                         engine="BP4") for f in vtx_fields]
+
+    step = 0
+    try:
+        for t_slice in time_chunks(n_timesteps, chunk_size):
+            n = t_slice.stop - t_slice.start
+            # the grids are assembled on rank 0 only
+            u_chunk = v_chunk = None
+            if buffers is not None:
+                u_chunk, v_chunk = (field[:n] for field in buffers.fields)
+            elif comm.rank == 0:
+                u_chunk, v_chunk = sampler.allocate(n, dtype=dtype)
+            for k in range(n):
+                for _ in range(save_every):
+                    solver.step()
+                    step += 1
+                    if vtx and step % vtx_every == 0:
+                        if vtx_job is not None:
+                            vtx_job.result()      # the copies are still being written
+                        for copy, f in zip(vtx_fields, (solver.u_, solver.p_)):
+                            copy.x.array[:] = f.x.array
+                        vtx_job = writer.submit(_write_vtx, vtx, solver.t)
+
+                    if forces is not None and step % forces_every == 0:
+                        C_D = comm.reduce(assemble_scalar(drag), root=0)
+                        C_L = comm.reduce(assemble_scalar(lift), root=0)
+                        p_local = [solver.p_.eval(point, cells)[0] if len(cells) else np.nan
+                                   for point, cells in zip(probe_points, probe_cells)]
+                        p_all = comm.gather(p_local, root=0)
+                        if comm.rank == 0:
+                            p_front, p_back = _first_found(p_all)
+                            forces["t"].append(solver.t)
+                            forces["C_D"].append(C_D)
+                            forces["C_L"].append(C_L)
+                            # the pressure is staggered half a step behind u
+                            forces["t_p"].append(solver.t - dt / 2)
+                            forces["p_diff"].append(p_front - p_back)
+                sampler.sample(solver.u_, out=(u_chunk[k], v_chunk[k]) if comm.rank == 0 else None)
+            yield t_slice, u_chunk, v_chunk
+            if buffers is not None:
+                buffers.swap(n)
+        if buffers is not None:
+            buffers.flush()
+        writer.flush()
+    finally:
+        writer.close()
+        for vtx_writer in vtx:
+            vtx_writer.close()
+        if vtx_comm is not None:
+            vtx_comm.Free()
+
+
+def _physics(reynolds, mu, rho, U_max):
+    """Viscosity for a Reynolds number Re = rho U_mean D / mu, U_mean = 2 U_max / 3."""
+    if reynolds is None:
+        return mu
+    return rho * (2 * U_max / 3) * (2 * R) / reynolds
+
+
+def generate_cylinder_wake(n_timesteps, nx=220*3, ny=41*3, dt=1/1800, save_every=1,
+                           reynolds=None, mu=0.00025, rho=1.0, U_max=1.5,
+                           res_min=R / 3, dtype=np.float32, return_forces=False,
+                           forces_every=1, chunk_size=1000, comm=None, vtx_dir=None,
+                           vtx_every=50, use_cache=True, cache_dir=CACHE_DIR):
+    """
+    Flow past a cylinder (DFG 2D-3 benchmark geometry, pulsating inflow)
+    solved with `IPCSSolver` and sampled on a uniform grid over the channel.
+
+    Parameters:
+      n_timesteps : Number of stored snapshots.
+      nx, ny : Number of grid points along the channel (x ∈ [0, 2.2]) and
+          across it (y ∈ [0, 0.41]).
+      dt : Solver time step.
+      save_every : Solver steps between stored snapshots.
+      reynolds : Reynolds number based on the mean inflow and the cylinder
+          diameter; overrides `mu` when given.
+      mu, rho : Dynamic viscosity and density.
+      U_max : Peak inflow velocity.
+      res_min : Mesh size at the cylinder.
+      dtype : Floating point type of the returned fields.
+      return_forces : Also return {"t", "C_D", "C_L", "t_p", "p_diff"}:
+          drag and lift at times t, and the pressure difference between the
+          front and the back of the cylinder at the staggered times t_p.
+      forces_every : Solver steps between two force samples.
+      chunk_size : Snapshots sampled between two hand-offs to the writer
+          thread, which copies them into the cache (or the output arrays)
+          while the solver fills the next chunk.
+      comm : mpi4py communicator, by default COMM_WORLD. Every rank solves
+          its part of the mesh and samples the grid points in its cells;
+          each snapshot is assembled on rank 0 with one Gatherv.
+      vtx_dir : Directory for ParaView (VTX) output of u and p, written by
+          the writer thread every `vtx_every` solver steps; None disables it.
+      use_cache : Serve the fields from the shared flow cache (read-only
+          memory maps), streaming them into it on a miss. The mesh is
+          cached in the same directory.
+      cache_dir : Cache directory or a configured FlowCache.
+
+    Points inside the cylinder are NaN.
+
+    Returns:
+       u_field, v_field of shape (n_timesteps, nx, ny) on rank 0 (and the
+       forces if return_forces); None on the other ranks.
+    """
+    comm = _get_comm(comm)
+    mu = _physics(reynolds, mu, rho, U_max)
+    shape = (n_timesteps, nx, ny)
+    forces = {name: [] for name in _FORCE_NAMES}
+
+    def solve(fields):
+        """Run the solver; on rank 0 the writer thread copies every chunk into `fields`."""
+        def sink(t_slice, u_chunk, v_chunk):
+            fields["u_field"][t_slice] = u_chunk
+            fields["v_field"][t_slice] = v_chunk
+
+        for _ in _iter_solution(n_timesteps, nx, ny, chunk_size, dt, mu, rho, U_max,
+                                save_every, res_min, dtype, comm, cache_dir, forces,
+                                forces_every, vtx_dir, vtx_every,
+                                sink=sink if comm.rank == 0 else None):
+            pass
+
+    if use_cache:
+        cache = get_cache(cache_dir)
+        params = dict(n_timesteps=n_timesteps, nx=nx, ny=ny, dt=dt, save_every=save_every,
+                      forces_every=forces_every, mu=mu, rho=rho, U_max=U_max,
+                      res_min=res_min, dtype=np.dtype(dtype).name)
+        fields = cache.load("cylinder_wake", _CACHE_VERSION, params) if comm.rank == 0 else None
+        if not comm.bcast(fields is not None, root=0):
+            if comm.rank == 0:
+                with cache.writing("cylinder_wake", _CACHE_VERSION, params,
+                                   ("u_field", "v_field"), shape, dtype) as maps:
+                    solve(maps)
+                fields = cache.load("cylinder_wake", _CACHE_VERSION, params)
+                fields.update(cache.store("cylinder_wake_forces", _CACHE_VERSION, params,
+                                          {name: np.asarray(values)
+                                           for name, values in forces.items()}))
+            else:
+                solve(None)
+        elif comm.rank == 0:
+            fields.update(cache.load("cylinder_wake_forces", _CACHE_VERSION, params) or {})
+        if comm.rank != 0:
+            return (None, None, None) if return_forces else (None, None)
+        u_field, v_field = fields["u_field"], fields["v_field"]
+        forces = {name: fields[name] for name in _FORCE_NAMES if name in fields}
+    else:
+        fields = None
+        if comm.rank == 0:
+            fields = dict(u_field=np.empty(shape, dtype=dtype),
+                          v_field=np.empty(shape, dtype=dtype))
+        solve(fields)
+        if comm.rank != 0:
+            return (None, None, None) if return_forces else (None, None)
+        u_field, v_field = fields["u_field"], fields["v_field"]
+        forces = {name: np.asarray(values) for name, values in forces.items()}
+
+    if return_forces:
+        return u_field, v_field, forces
+    return u_field, v_field
+
+
+def iter_cylinder_wake_chunks(n_timesteps, nx=220*3, ny=41*3, chunk_size=1000, dt=1/1800,
+                              save_every=1, reynolds=None, mu=0.00025, rho=1.0, U_max=1.5,
+                              res_min=R / 3, dtype=np.float32, comm=None, vtx_dir=None,
+                              vtx_every=50, cache_dir=CACHE_DIR):
+    """
+    Streaming variant of `generate_cylinder_wake`.
+
+    Yields `(t_slice, u_chunk, v_chunk)` blocks of at most `chunk_size`
+    snapshots while the solver runs, so long runs never hold the whole
+    trajectory in memory. Every block is a new array and may be handed to
+    a background writer. On ranks other than 0 the chunks are None, but
+    every rank must iterate to keep the collective solver calls in step.
+    """
+    comm = _get_comm(comm)
+    yield from _iter_solution(n_timesteps, nx, ny, chunk_size, dt,
+                              _physics(reynolds, mu, rho, U_max), rho, U_max, save_every,
+                              res_min, dtype, comm, cache_dir, vtx_dir=vtx_dir,
+                              vtx_every=vtx_every)
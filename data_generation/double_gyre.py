@@ -1,85 +1,155 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from .chunking import check_out, time_chunks
+from .flow_cache import CACHE_DIR, get_cache
+
+_CACHE_VERSION = 1
+
+
+def _fill_double_gyre(times, x, y, A, epsilon, omega, u_out, v_out):
+    """
+    Evaluate the double gyre at every time in `times` and write the result
+    into `u_out`, `v_out` (shape (len(times), nx, ny)).
+
+    f(x,t) and df/dx only depend on (t, x), and the y-factors only on y, so
+    they are evaluated on (T, nx, 1) and (1, 1, ny) slabs and broadcast into
+    the output.  No full-size temporaries are allocated.
+    """
+    dtype = u_out.dtype
+    sin_omega_t = np.sin(omega * np.asarray(times, dtype=np.float64))[:, None, None]
+    X = x[None, :, None]
+
+    # f(x,t) = ε sin(ω t) x² + (1 - 2ε sin(ω t)) x
+    f = epsilon * sin_omega_t * X**2 + (1 - 2*epsilon*sin_omega_t) * X
+    dfdx = 2 * epsilon * sin_omega_t * X + (1 - 2*epsilon*sin_omega_t)
+
+    u_x = (- np.pi * A * np.sin(np.pi * f)).astype(dtype, copy=False)
+    v_x = (np.pi * A * np.cos(np.pi * f)).astype(dtype, copy=False)
+    cos_y = np.cos(np.pi * y).astype(dtype, copy=False)[None, None, :]
+    sin_y = np.sin(np.pi * y).astype(dtype, copy=False)[None, None, :]
+
+    np.multiply(u_x, cos_y, out=u_out)
+    np.multiply(v_x, sin_y, out=v_out)
+    v_out *= dfdx.astype(dtype, copy=False)
+
 
 def generate_double_gyre_flow(n_timesteps, nx, ny, lx=2, ly=1,
-                              A=0.1, epsilon=0.25, period=20, 
-                              plot_series=False):
-    """   
+                              A=0.1, epsilon=0.25, period=20,
+                              plot_series=False, dtype=np.float32,
+                              out=None, return_magnitude=False,
+                              use_cache=False, cache_dir=CACHE_DIR):
+    """
     The double gyre is defined on the domain x ∈ [0,2] and y ∈ [0,1]. Its velocity field is given by:
-    
+
         f(x,t) = ε sin(ω t) x² + (1 - 2ε sin(ω t)) x
         u(x,y,t) = -π A sin(π f(x,t)) cos(π y)
         v(x,y,t) =  π A cos(π f(x,t)) sin(π y) [2ε sin(ω t) x + (1 - 2ε sin(ω t))]
-    
+
     Parameters:
       n_timesteps : Number of timesteps.
       nx, ny : Number of spatial grid points in x and y directions.
       A : Amplitude of the velocity.
       epsilon : Strength of the time-periodic oscillation.
       period : Number of intervals for flow to repeat
-      plot_series 
-    
+      plot_series
+      dtype : Floating point type of the returned fields. float32 halves the
+          footprint of long runs; pass np.float64 to reproduce the old output.
+      out : Optional (u_out, v_out) pair of preallocated arrays of shape
+          (n_timesteps, nx, ny). Their dtype overrides `dtype`.
+      return_magnitude : Also return the speed sqrt(u² + v²).
+      use_cache : Serve the fields from the shared flow cache (read-only
+          memory maps), generating and storing them on a miss.
+      cache_dir : Cache directory or a configured FlowCache.
+
     Returns:
-       u_field, v_field 
+       u_field, v_field  (and magnitude if return_magnitude)
     """
     omega = 2*np.pi / period
 
-    data    = np.zeros((n_timesteps, nx, ny))
-    u_field = np.zeros((n_timesteps, nx, ny))
-    v_field = np.zeros((n_timesteps, nx, ny))
-
     x = np.linspace(0, lx, nx)
     y = np.linspace(0, ly, ny)
+    shape = (n_timesteps, nx, ny)
+    if out is not None:
+        check_out(out, shape)
+        dtype = out[0].dtype
+
+    if use_cache:
+        params = dict(n_timesteps=n_timesteps, nx=nx, ny=ny, lx=lx, ly=ly, A=A,
+                      epsilon=epsilon, period=period, dtype=np.dtype(dtype).name)
+        u_field, v_field = get_cache(cache_dir).fetch(
+            "double_gyre", _CACHE_VERSION, params,
+            lambda: generate_double_gyre_flow(n_timesteps, nx, ny, lx, ly, A,
+                                              epsilon, period, dtype=dtype))
+        if out is not None:
+            np.copyto(out[0], u_field)
+            np.copyto(out[1], v_field)
+            u_field, v_field = out
+    else:
+        if out is None:
+            u_field = np.empty(shape, dtype=dtype)
+            v_field = np.empty(shape, dtype=dtype)
+        else:
+            u_field, v_field = out
 
-    Xgrid, Ygrid = np.meshgrid(x, y, indexing='ij')
-    
-    for t in range(n_timesteps):
         # Time variable (assuming unit time steps)
-        time = t
-        sin_omega_t = np.sin(omega * time)
-        
-        # Define the function f(x,t) and its derivative with respect to x:
-        # f(x,t) = ε sin(ω t) x² + (1 - 2ε sin(ω t)) x
-        f = epsilon * sin_omega_t * Xgrid**2 + (1 - 2*epsilon*sin_omega_t) * Xgrid
-        dfdx = 2 * epsilon * sin_omega_t * Xgrid + (1 - 2*epsilon*sin_omega_t)
-        
-        # Compute velocity components
-        u = - np.pi * A * np.sin(np.pi * f) * np.cos(np.pi * Ygrid)
-        v =   np.pi * A * np.cos(np.pi * f) * np.sin(np.pi * Ygrid) * dfdx
-        
-        u_field[t] = u
-        v_field[t] = v
-        data[t] = np.sqrt(u**2 + v**2)
-    
+        _fill_double_gyre(np.arange(n_timesteps), x, y, A, epsilon, omega,
+                          u_field, v_field)
+
     if plot_series:
+        Xgrid, Ygrid = np.meshgrid(x, y, indexing='ij')
         fig, axes = plt.subplots(1, n_timesteps, figsize=(4 * n_timesteps, 4))
         for t in range(0, n_timesteps, 1):
             ax = axes[t]
-            
+
             # Plot magnitute
-            # im = ax.imshow(data[t].T, origin='lower', extent=[0,lx,0,ly], cmap='viridis')
+            # im = ax.imshow(np.hypot(u_field[t], v_field[t]).T, origin='lower', extent=[0,lx,0,ly], cmap='viridis')
             # plt.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
-            
+
             # Plot direction
-            ax.quiver(Xgrid, Ygrid, u_field[t], v_field[t], color='black', 
+            ax.quiver(Xgrid, Ygrid, u_field[t], v_field[t], color='black',
                        scale_units='xy', scale=10, width=0.005, pivot='mid')
-            
+
             ax.set_title(f"Double Gyre Flow - Time Step {t}")
             ax.set_xlabel("x")
             ax.set_ylabel("y")
-        
+
         plt.tight_layout()
         plt.show()
-    
+
+    if return_magnitude:
+        return u_field, v_field, np.hypot(u_field, v_field)
     return u_field, v_field
 
 
+def iter_double_gyre_chunks(n_timesteps, nx, ny, chunk_size, lx=2, ly=1,
+                            A=0.1, epsilon=0.25, period=20,
+                            dtype=np.float32):
+    """
+    Streaming variant of `generate_double_gyre_flow`.
+
+    Yields `(t_slice, u_chunk, v_chunk)` blocks of at most `chunk_size`
+    timesteps, so only one block is held in memory at a time. Concatenating
+    the chunks along axis 0 reproduces the eager result bit for bit.
+    """
+    omega = 2*np.pi / period
+    x = np.linspace(0, lx, nx)
+    y = np.linspace(0, ly, ny)
+
+    for t_slice in time_chunks(n_timesteps, chunk_size):
+        n = t_slice.stop - t_slice.start
+        u_chunk = np.empty((n, nx, ny), dtype=dtype)
+        v_chunk = np.empty((n, nx, ny), dtype=dtype)
+        _fill_double_gyre(np.arange(t_slice.start, t_slice.stop), x, y,
+                          A, epsilon, omega, u_chunk, v_chunk)
+        yield t_slice, u_chunk, v_chunk
+
+
 if __name__ == "__main__":
     # Generate the double gyre flow data over 50 timesteps on a 100x50 grid.
     _ = generate_double_gyre_flow(
         n_timesteps=6, nx=30, ny=15, lx=2, ly=1,
-        A=0.1, epsilon=0.5, 
+        A=0.1, epsilon=0.5,
         period=6,
         plot_series=True
     )
@@ -0,0 +1,200 @@
+import json, hashlib, os, shutil, tempfile, numpy as np
+from contextlib import contextmanager
+from pathlib import Path
+
+CURRENT_DIR = Path(__file__).resolve().parent
+CACHE_DIR = CURRENT_DIR / ".flow_cache"
+
+
+def _jsonable(obj):
+    """json.dumps fallback for the numpy values that show up in parameters."""
+    if isinstance(obj, np.ndarray):
+        digest = hashlib.sha256(np.ascontiguousarray(obj).tobytes()).hexdigest()
+        return dict(shape=obj.shape, dtype=str(obj.dtype), sha256=digest)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (type, np.dtype)):
+        return np.dtype(obj).name
+    if isinstance(obj, Path):
+        return str(obj)
+    raise TypeError(f"cannot hash parameter of type {type(obj).__name__}")
+
+
+def cache_key(generator: str, version, params: dict) -> str:
+    """Content address of one generator call: name, code version and parameters."""
+    payload = json.dumps(dict(generator=generator, version=version, params=params),
+                         sort_keys=True, default=_jsonable)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class FlowCache:
+    """
+    On-disk cache of generated flows, shared by every generator.
+
+    Each entry is a directory `<generator>-<key>/` holding one raw `.npy`
+    file per array. Hits are opened with `np.load(mmap_mode='r')`, so they
+    cost no decompression and no copy into RAM; the returned arrays are
+    read-only memory maps.
+
+    Entries are written into a temporary directory and renamed into place,
+    so concurrent workers never observe a half-written entry. When
+    `max_bytes` is set, the least recently used entries are evicted after
+    every store until the cache fits.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=None):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def entry_dir(self, generator: str, key: str) -> Path:
+        return self.cache_dir / f"{generator}-{key}"
+
+    def load_entry(self, generator: str, key: str):
+        """Memory-map every array of an entry, or return None on a miss."""
+        entry = self.entry_dir(generator, key)
+        try:
+            files = sorted(entry.glob("*.npy"))
+            arrays = {f.stem: np.load(f, mmap_mode="r") for f in files}
+        except FileNotFoundError:
+            # Missing, or evicted while we were opening it.
+            return None
+        try:
+            # Mark as recently used for the LRU policy.
+            os.utime(entry)
+        except OSError:
+            # Read-only shared cache, or evicted after opening; the maps
+            # stay valid either way.
+            pass
+        return arrays or None
+
+    def load(self, generator: str, version, params: dict):
+        return self.load_entry(generator, cache_key(generator, version, params))
+
+    def _tmp_dir(self) -> Path:
+        return Path(tempfile.mkdtemp(prefix=".tmp-", dir=self.cache_dir))
+
+    def _publish(self, tmp: Path, generator: str, key: str):
+        """Atomically move a fully written temporary entry into place."""
+        entry = self.entry_dir(generator, key)
+        try:
+            os.rename(tmp, entry)
+        except OSError:
+            # Another worker published the same entry first; keep theirs.
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not entry.exists():
+                raise
+        self.evict(keep=entry)
+        return self.load_entry(generator, key)
+
+    def store_entry(self, generator: str, key: str, arrays: dict):
+        tmp = self._tmp_dir()
+        try:
+            for name, arr in arrays.items():
+                np.save(tmp / f"{name}.npy", arr)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        return self._publish(tmp, generator, key)
+
+    def store(self, generator: str, version, params: dict, arrays: dict):
+        """Write `arrays` and return them again as read-only memory maps."""
+        return self.store_entry(generator, cache_key(generator, version, params), arrays)
+
+    @contextmanager
+    def writing(self, generator: str, version, params: dict, names, shape, dtype):
+        """
+        Yield a dict of writable (shape, dtype) memory maps, one per name,
+        and publish them as the entry of this call when the block exits
+        cleanly; on an exception nothing is published. Read the entry back
+        with `load`.
+        """
+        tmp = self._tmp_dir()
+        try:
+            maps = {name: np.lib.format.open_memmap(tmp / f"{name}.npy", mode="w+",
+                                                    dtype=dtype, shape=shape)
+                    for name in names}
+            yield maps
+            for m in maps.values():
+                m.flush()
+            del maps
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self._publish(tmp, generator, cache_key(generator, version, params))
+
+    def store_chunks(self, generator: str, version, params: dict, names, shape, dtype, chunks):
+        """
+        Fill an entry from `(t_slice, *arrays)` chunks, as yielded by the
+        `iter_*_chunks` generators, without holding the full trajectory in
+        memory. `shape` is the full (n_timesteps, ...) shape of each array.
+        """
+        with self.writing(generator, version, params, names, shape, dtype) as maps:
+            for t_slice, *arrays in chunks:
+                for m, arr in zip(maps.values(), arrays):
+                    m[t_slice] = arr
+        return self.load(generator, version, params)
+
+    def fetch(self, generator: str, version, params: dict, compute,
+              names=("u_field", "v_field")):
+        """
+        Return the cached arrays for this call, running `compute()` (which
+        must return arrays in `names` order) and storing its result on a miss.
+        Generators bump `version` whenever their output changes, which
+        invalidates every entry they stored before.
+        """
+        arrays = self.load(generator, version, params)
+        if arrays is None:
+            arrays = self.store(generator, version, params, dict(zip(names, compute())))
+        return tuple(arrays[name] for name in names)
+
+    def entries(self):
+        return [p for p in self.cache_dir.iterdir()
+                if p.is_dir() and not p.name.startswith(".tmp-")]
+
+    def keys(self, generator: str, prefix: str = ""):
+        """Keys of the entries of `generator` whose key starts with `prefix`."""
+        head = f"{generator}-"
+        return [e.name[len(head):] for e in self.entries()
+                if e.name.startswith(head + prefix)]
+
+    def evict(self, keep=None):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        if self.max_bytes is None:
+            return
+        sized = []
+        for entry in self.entries():
+            try:
+                size = sum(f.stat().st_size for f in entry.iterdir())
+                sized.append((entry.stat().st_mtime, size, entry))
+            except FileNotFoundError:
+                continue
+        total = sum(size for _, size, _ in sized)
+        for _, size, entry in sorted(sized, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            if keep is not None and entry == keep:
+                continue
+            self.remove(entry)
+            total -= size
+
+    def remove(self, entry: Path):
+        # Rename first so readers see either the whole entry or nothing.
+        # Arrays that are already memory-mapped stay valid after unlinking.
+        tmp = self._tmp_dir()
+        try:
+            os.rename(entry, tmp / entry.name)
+        except FileNotFoundError:
+            pass
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    def clear(self):
+        for entry in self.entries():
+            self.remove(entry)
+
+
+def get_cache(cache_dir=CACHE_DIR) -> FlowCache:
+    """Accept either a cache directory or a configured FlowCache."""
+    if isinstance(cache_dir, FlowCache):
+        return cache_dir
+    return FlowCache(cache_dir)
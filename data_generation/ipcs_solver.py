@@ -0,0 +1,214 @@
+import numpy as np
+from petsc4py import PETSc
+
+from basix.ufl import element
+from dolfinx.fem import (Constant, Function, dirichletbc, form, functionspace,
+                         locate_dofs_topological)
+from dolfinx.fem.petsc import (apply_lifting, assemble_matrix, assemble_vector,
+                               create_matrix, create_vector, set_bc)
+from ufl import (TestFunction, TrialFunction, div, dot, dx, grad, inner, lhs,
+                 nabla_grad, rhs)
+
+
+class InletVelocity:
+    """
+    Parabolic inflow of the DFG 2D-3 benchmark with peak 1.5 sin(πt/8), plus
+    a small vertical wiggle that breaks the symmetry of the wake.
+    """
+
+    def __init__(self, t, H=0.41, U_max=1.5, wiggle=0.02, wiggle_period=1.5):
+        self.t = t
+        self.H = H
+        self.U_max = U_max
+        self.wiggle = wiggle
+        self.wiggle_period = wiggle_period
+
+    def __call__(self, x):
+        values = np.zeros((2, x.shape[1]), dtype=PETSc.ScalarType)
+        values[0] = (4 * self.U_max * np.sin(self.t * np.pi / 8)
+                     * x[1] * (self.H - x[1]) / self.H**2)
+        values[1] = self.wiggle * np.sin(self.t * 2*np.pi / self.wiggle_period)
+        return values
+
+
+def _ksp(comm, A, ksp_type, pc_type, warm_start):
+    solver = PETSc.KSP().create(comm)
+    solver.setOperators(A)
+    solver.setType(ksp_type)
+    solver.getPC().setType(pc_type)
+    # start from the previous solution, which is close to the new one
+    solver.setInitialGuessNonzero(warm_start)
+    return solver
+
+
+class IPCSSolver:
+    """
+    Incremental pressure correction scheme for the cylinder wake:
+    Crank-Nicolson in time with a semi-implicit Adams-Bashforth convection
+    term, as in the DOLFINx DFG 2D-3 demo.
+
+    The tentative-velocity operator is split into a constant part (mass and
+    diffusion), assembled once, and the convective part, which depends on
+    u_n and u_{n-1} and is reassembled every step into the same sparsity
+    pattern before the constant part is added with `axpy`. Dirichlet rows
+    get their unit diagonal from the constant part only (the convective
+    part is assembled with `diagonal=0`). All three Krylov solves start
+    from the previous solution.
+
+    Parameters
+    ----------
+    mesh, facet_tags : mesh and facet markers, e.g. from `gmshio.model_to_mesh`.
+    markers : dict with the facet markers "inlet", "outlet", "wall" and "obstacle".
+    dt, mu, rho : time step, dynamic viscosity and density.
+    inlet_velocity : callable x -> (2, n) inflow with a settable `t`,
+        by default `InletVelocity`.
+    split_assembly : reassemble only the convective part of step 1. With
+        False the whole step-1 operator is assembled every step, as in
+        the demo (useful as a benchmark baseline).
+    warm_start : use the previous solutions as initial guesses.
+
+    Example
+    -------
+    >>> solver = IPCSSolver(mesh, ft, markers, dt=1/1800, mu=2.5e-4, rho=1)
+    >>> for i in range(num_steps):
+    ...     solver.step()
+    >>> solver.u_, solver.p_            # velocity and pressure at solver.t
+    """
+
+    def __init__(self, mesh, facet_tags, markers, dt, mu, rho=1.0, inlet_velocity=None,
+                 t0=0.0, split_assembly=True, warm_start=True):
+        self.mesh = mesh
+        self.t = t0
+        self.dt = dt
+        self.split_assembly = split_assembly
+        gdim = mesh.geometry.dim
+        fdim = mesh.topology.dim - 1
+
+        v_cg2 = element("Lagrange", mesh.topology.cell_name(), 2, shape=(gdim, ))
+        s_cg1 = element("Lagrange", mesh.topology.cell_name(), 1)
+        V = self.V = functionspace(mesh, v_cg2)
+        Q = self.Q = functionspace(mesh, s_cg1)
+
+        # Boundary conditions
+        self.inlet_velocity = inlet_velocity or InletVelocity(t0)
+        self.inlet_velocity.t = t0
+        self.u_inlet = Function(V)
+        self.u_inlet.interpolate(self.inlet_velocity)
+        u_nonslip = np.array((0,) * gdim, dtype=PETSc.ScalarType)
+
+        def facets(name):
+            return facet_tags.find(markers[name])
+
+        self.bcu = [dirichletbc(self.u_inlet, locate_dofs_topological(V, fdim, facets("inlet"))),
+                    dirichletbc(u_nonslip, locate_dofs_topological(V, fdim, facets("obstacle")), V),
+                    dirichletbc(u_nonslip, locate_dofs_topological(V, fdim, facets("wall")), V)]
+        self.bcp = [dirichletbc(PETSc.ScalarType(0),
+                                locate_dofs_topological(Q, fdim, facets("outlet")), Q)]
+
+        # Unknowns and previous states
+        u, v = TrialFunction(V), TestFunction(V)
+        p, q = TrialFunction(Q), TestFunction(Q)
+        self.u_ = Function(V, name="u")
+        self.u_s = Function(V)
+        self.u_n = Function(V)
+        self.u_n1 = Function(V)
+        self.p_ = Function(Q, name="p")
+        self.phi = Function(Q)
+
+        k = Constant(mesh, PETSc.ScalarType(dt))
+        self.mu = mu = Constant(mesh, PETSc.ScalarType(mu))
+        self.rho = rho = Constant(mesh, PETSc.ScalarType(rho))
+        f = Constant(mesh, PETSc.ScalarType((0,) * gdim))
+        u_n, u_n1, p_ = self.u_n, self.u_n1, self.p_
+
+        # Step 1: tentative velocity
+        convection = 1.5 * u_n - 0.5 * u_n1
+        F1 = rho / k * dot(u - u_n, v) * dx
+        F1 += inner(dot(convection, 0.5 * nabla_grad(u + u_n)), v) * dx
+        F1 += 0.5 * mu * inner(grad(u + u_n), grad(v)) * dx - dot(p_, div(v)) * dx
+        F1 += dot(f, v) * dx
+        self.a1 = form(lhs(F1))
+        self.L1 = form(rhs(F1))
+        self.a1_conv = form(inner(dot(convection, 0.5 * nabla_grad(u)), v) * dx)
+        self.A1 = create_matrix(self.a1)
+        self.b1 = create_vector(self.L1)
+        if split_assembly:
+            self.A1_const = assemble_matrix(
+                form(rho / k * dot(u, v) * dx + 0.5 * mu * inner(grad(u), grad(v)) * dx),
+                bcs=self.bcu)
+            self.A1_const.assemble()
+
+        # Step 2: pressure correction
+        self.a2 = form(dot(grad(p), grad(q)) * dx)
+        self.L2 = form(-rho / k * dot(div(self.u_s), q) * dx)
+        self.A2 = assemble_matrix(self.a2, bcs=self.bcp)
+        self.A2.assemble()
+        self.b2 = create_vector(self.L2)
+
+        # Step 3: velocity correction
+        self.a3 = form(rho * dot(u, v) * dx)
+        self.L3 = form(rho * dot(self.u_s, v) * dx - k * dot(nabla_grad(self.phi), v) * dx)
+        self.A3 = assemble_matrix(self.a3)
+        self.A3.assemble()
+        self.b3 = create_vector(self.L3)
+
+        self.solver1 = _ksp(mesh.comm, self.A1, PETSc.KSP.Type.BCGS, PETSc.PC.Type.JACOBI,
+                            warm_start)
+        self.solver2 = _ksp(mesh.comm, self.A2, PETSc.KSP.Type.MINRES, PETSc.PC.Type.HYPRE,
+                            warm_start)
+        self.solver2.getPC().setHYPREType("boomeramg")
+        self.solver3 = _ksp(mesh.comm, self.A3, PETSc.KSP.Type.CG, PETSc.PC.Type.SOR,
+                            warm_start)
+
+    def _assemble_A1(self):
+        A1 = self.A1
+        A1.zeroEntries()
+        if self.split_assembly:
+            assemble_matrix(A1, self.a1_conv, bcs=self.bcu, diagonal=0.0)
+            A1.assemble()
+            A1.axpy(1.0, self.A1_const, PETSc.Mat.Structure.SUBSET_NONZERO_PATTERN)
+        else:
+            assemble_matrix(A1, self.a1, bcs=self.bcu)
+            A1.assemble()
+
+    @staticmethod
+    def _assemble_rhs(b, L, a=None, bcs=()):
+        with b.localForm() as loc:
+            loc.set(0)
+        assemble_vector(b, L)
+        if a is not None:
+            apply_lifting(b, [a], [bcs])
+        b.ghostUpdate(addv=PETSc.InsertMode.ADD_VALUES, mode=PETSc.ScatterMode.REVERSE)
+        if bcs:
+            set_bc(b, bcs)
+
+    def step(self):
+        """Advance u_ and p_ by one time step."""
+        self.t += self.dt
+        self.inlet_velocity.t = self.t
+        self.u_inlet.interpolate(self.inlet_velocity)
+
+        # Step 1: Tentative velocity step
+        self._assemble_A1()
+        self._assemble_rhs(self.b1, self.L1, self.a1, self.bcu)
+        self.solver1.solve(self.b1, self.u_s.x.petsc_vec)
+        self.u_s.x.scatter_forward()
+
+        # Step 2: Pressure correction step
+        self._assemble_rhs(self.b2, self.L2, self.a2, self.bcp)
+        self.solver2.solve(self.b2, self.phi.x.petsc_vec)
+        self.phi.x.scatter_forward()
+
+        self.p_.x.petsc_vec.axpy(1, self.phi.x.petsc_vec)
+        self.p_.x.scatter_forward()
+
+        # Step 3: Velocity correction step
+        self._assemble_rhs(self.b3, self.L3)
+        self.solver3.solve(self.b3, self.u_.x.petsc_vec)
+        self.u_.x.scatter_forward()
+
+        # Update variable with solution form this time step
+        u_, u_n, u_n1 = self.u_, self.u_n, self.u_n1
+        with u_.x.petsc_vec.localForm() as loc_, u_n.x.petsc_vec.localForm() as loc_n, u_n1.x.petsc_vec.localForm() as loc_n1:
+            loc_n.copy(loc_n1)
+            loc_.copy(loc_n)
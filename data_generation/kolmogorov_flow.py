@@ -1,18 +1,76 @@
-import json, hashlib, tempfile, numpy as np
+import tempfile, numpy as np
+from functools import lru_cache
 from pathlib import Path
 import matplotlib.pyplot as plt
 
-from fluidsim.solvers.ns2d.solver import Simul as SimulBase
-from fluidsim.base.forcing.kolmogorov import extend_simul_class, KolmogorovFlow
+from .flow_cache import CACHE_DIR, cache_key, get_cache
 
-Simul = extend_simul_class(SimulBase, KolmogorovFlow)
+_CACHE_VERSION = 1
 
-CURRENT_DIR = Path(__file__).resolve().parent
-CACHE_DIR = CURRENT_DIR / ".flow_cache"
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
-def _param_hash(dic: dict) -> str:
-    return hashlib.md5(json.dumps(dic, sort_keys=True).encode()).hexdigest()
+@lru_cache(maxsize=None)
+def _simul_class():
+    # fluidsim (and pyfftw behind it) is only needed to run the solver, not
+    # to import the package or to serve cached runs
+    from fluidsim.solvers.ns2d.solver import Simul as SimulBase
+    from fluidsim.base.forcing.kolmogorov import extend_simul_class, KolmogorovFlow
+    return extend_simul_class(SimulBase, KolmogorovFlow)
+
+
+def _make_simul(n_timesteps, nx, ny, lx, ly, dt, nu, forcing_amp, kf, seed):
+    Simul = _simul_class()
+
+    # FluidSim parameter 
+    params = Simul.create_default_params()
+    params.oper.nx, params.oper.ny = nx, ny
+    params.oper.Lx, params.oper.Ly = lx, ly
+    params.oper.type_fft = "fft2d.with_pyfftw"
+
+    params.nu_2 = nu
+
+    # Fixed time step; we step manually
+    params.time_stepping.USE_CFL = False
+    params.time_stepping.deltat0 = dt
+    params.time_stepping.t_end = n_timesteps * dt
+
+    # Kolmogorov forcing
+    params.forcing.enable = True
+    params.forcing.type = "kolmogorov_flow"
+    params.forcing.kolmo.ik = kf
+    params.forcing.kolmo.amplitude = forcing_amp
+
+    # Noise initial condition 
+    params.init_fields.type = "noise"
+    params.init_fields.noise.length = ly / kf 
+
+    # Silence outputs and save nothing on disk
+    params.output.sub_directory = tempfile.mkdtemp()
+    params.output.HAS_TO_SAVE = False
+    params.output.periods_print.print_stdout = n_timesteps + 1
+
+    # FluidSim draws the noise from numpy's global generator; seed it for
+    # the construction only and leave the caller's random state untouched.
+    rng_state = np.random.get_state()
+    np.random.seed(seed)
+    try:
+        return Simul(params)
+    finally:
+        np.random.set_state(rng_state)
+
+
+def _prefix_key(family: str, n_timesteps: int) -> str:
+    return f"{family}-{n_timesteps:010d}"
+
+
+def _cached_prefixes(cache, family: str) -> dict:
+    """Map trajectory length -> cache key for every cached prefix of a run."""
+    prefixes = {}
+    for key in cache.keys("kolmogorov", family + "-"):
+        try:
+            prefixes[int(key[len(family) + 1:])] = key
+        except ValueError:
+            continue
+    return prefixes
 
 
 def generate_cfd_kolmogorov_flow(n_timesteps: int,
@@ -24,72 +82,91 @@ def generate_cfd_kolmogorov_flow(n_timesteps: int,
                                  nu: float = 1e-3,
                                  forcing_amp: float = 0.1,
                                  kf: int = 4,
+                                 save_every: int = 1,
+                                 spinup_steps: int = 0,
+                                 seed: int = 0,
                                  use_cache: bool = True,
                                  cache_dir: Path = CACHE_DIR,
                                  plot_series: bool = False,
                                  plot_every: int = 1):
     """
+    Cached trajectories are keyed by the physical parameters plus their
+    length. Every entry also stores the solver's spectral state after its
+    last snapshot, so a request for a longer trajectory resumes from the
+    longest cached prefix and only integrates the missing steps; shorter
+    requests are served as slices of a longer cached run.
+
+    Snapshot k is taken after `spinup_steps + k * save_every` solver steps:
+    the initial transient is integrated but never stored, and only every
+    `save_every`-th step is kept. The output holds the kept snapshots only.
+
+    `seed` fixes the noise initial condition and is part of the cache key,
+    so cached and freshly computed runs agree on every node.
+
     Returns
     -------
     u_field, v_field : ndarray
-        Shapes (n_timesteps, nx, ny)
+        Shapes (n_timesteps, nx, ny). With `use_cache` these are read-only
+        memory maps into the shared flow cache (see `flow_cache.FlowCache`).
     """
     # cache lookup
-    key = _param_hash(dict(n_timesteps=n_timesteps, nx=nx, ny=ny, lx=lx, ly=ly,
-                           dt=dt, nu=nu, forcing_amp=forcing_amp, kf=kf))
-    print(cache_dir)
-    cache_file = cache_dir / f"kolmo_{key}.npz"
-    if use_cache and cache_file.exists():
-        data = np.load(cache_file)
-        u_field, v_field = data["u_field"], data["v_field"]
+    if save_every < 1 or spinup_steps < 0:
+        raise ValueError("save_every must be >= 1 and spinup_steps >= 0")
+    physics = dict(nx=nx, ny=ny, lx=lx, ly=ly, dt=dt, nu=nu,
+                   forcing_amp=forcing_amp, kf=kf,
+                   save_every=save_every, spinup_steps=spinup_steps, seed=seed)
+    cache = get_cache(cache_dir) if use_cache else None
+    family = cache_key("kolmogorov", _CACHE_VERSION, physics)
+    prefixes = _cached_prefixes(cache, family) if cache else {}
+
+    longer = [n for n in prefixes if n >= n_timesteps]
+    cached = cache.load_entry("kolmogorov", prefixes[min(longer)]) if longer else None
+    if cached is not None:
+        u_field = cached["u_field"][:n_timesteps]
+        v_field = cached["v_field"][:n_timesteps]
     else:
-        # FluidSim parameter 
-        params = Simul.create_default_params()
-        params.oper.nx, params.oper.ny = nx, ny
-        params.oper.Lx, params.oper.Ly = lx, ly
-        params.oper.type_fft = "fft2d.with_pyfftw"
-
-        params.nu_2 = nu
-
-        # Fixed time step; we step manually
-        params.time_stepping.USE_CFL = False
-        params.time_stepping.deltat0 = dt
-        params.time_stepping.t_end = n_timesteps * dt
-
-        # Kolmogorov forcing
-        params.forcing.enable = True
-        params.forcing.type = "kolmogorov_flow"
-        params.forcing.kolmo.ik = kf
-        params.forcing.kolmo.amplitude = forcing_amp
-
-        # Noise initial condition 
-        params.init_fields.type = "noise"
-        params.init_fields.noise.length = ly / kf 
-
-        # Silence outputs and save nothing on disk
-        params.output.sub_directory = tempfile.mkdtemp()
-        params.output.HAS_TO_SAVE = False
-        params.output.periods_print.print_stdout = n_timesteps + 1
-
         # run solver 
-        sim = Simul(params)
-        sim.state.statephys_from_statespect()  # create physical arrays 
+        n_steps = spinup_steps + (n_timesteps - 1) * save_every
+        sim = _make_simul(n_steps, nx, ny, lx, ly, dt, nu, forcing_amp, kf, seed)
 
         u_field = np.empty((n_timesteps, nx, ny), dtype=np.float32)
         v_field = np.empty_like(u_field)
 
-        for it in range(n_timesteps):
-            # store current physical fields
-            u_field[it] = sim.state.get_var("ux").copy()
-            v_field[it] = sim.state.get_var("uy").copy()
+        # resume from the longest cached prefix, if any
+        n_done = 0
+        shorter = [n for n in prefixes if n < n_timesteps]
+        resume_key = prefixes[max(shorter)] if shorter else None
+        prefix = cache.load_entry("kolmogorov", resume_key) if resume_key else None
+        if prefix is not None:
+            n_done = len(prefix["u_field"])
+            u_field[:n_done] = prefix["u_field"]
+            v_field[:n_done] = prefix["v_field"]
+            sim.state.state_spect[...] = prefix["state_spect"]
+            sim.time_stepping.t = float(prefix["time"])
+            sim.time_stepping.it = spinup_steps + (n_done - 1) * save_every
+        sim.state.statephys_from_statespect()  # create physical arrays 
 
-            # advance one RK4 step, except after the last snapshot
-            if it < n_timesteps - 1:
+        for it in range(n_done, n_timesteps):
+            # advance to the solver step of this snapshot; one_time_step
+            # already refreshes the physical fields (RK4 reads them in its
+            # first stage), so no extra conversion or copy is needed
+            for _ in range(save_every if it > 0 else spinup_steps):
                 sim.time_stepping.one_time_step()
-                sim.state.statephys_from_statespect()
+
+            # store current physical fields
+            u_field[it] = sim.state.get_var("ux")
+            v_field[it] = sim.state.get_var("uy")
 
         if use_cache:
-            np.savez_compressed(cache_file, u_field=u_field, v_field=v_field)
+            cached = cache.store_entry(
+                "kolmogorov", _prefix_key(family, n_timesteps),
+                dict(u_field=u_field, v_field=v_field,
+                     state_spect=np.asarray(sim.state.state_spect),
+                     time=np.asarray(sim.time_stepping.t)))
+            u_field, v_field = cached["u_field"], cached["v_field"]
+            # the new entry supersedes the prefix it was extended from
+            if prefix is not None:
+                cache.remove(cache.entry_dir("kolmogorov", resume_key))
 
     if plot_series:
         n_show = n_timesteps // plot_every
@@ -110,7 +187,7 @@ def generate_cfd_kolmogorov_flow(n_timesteps: int,
                       v_field[it_snap, ::stride, ::stride],
                       color='black',scale_units='xy', scale=None,
                       width=0.005, pivot='mid')
-            ax.set_title(f"t = {it_snap*dt:.3f}")
+            ax.set_title(f"t = {(spinup_steps + it_snap*save_every)*dt:.3f}")
             ax.set_xlabel("x"); ax.set_ylabel("y")
         plt.tight_layout(); plt.show()
 
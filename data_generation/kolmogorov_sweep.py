@@ -0,0 +1,138 @@
+import itertools, os
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from thread_limits import limit_threads, thread_env
+
+from .flow_cache import CACHE_DIR
+from .kolmogorov_flow import generate_cfd_kolmogorov_flow
+
+# Arguments fixed by the sweep itself, which cases and `common` must not set.
+_FIXED_ARGS = ("use_cache", "plot_series")
+
+
+def parameter_grid(grid: dict) -> list:
+    """
+    Expand {name: [values, ...]} into the list of all combinations, e.g.
+    {"nu": [1e-3, 2e-3], "kf": [4]} -> [{"kf": 4, "nu": 1e-3}, {"kf": 4, "nu": 2e-3}].
+    """
+    names = sorted(grid)
+    return [dict(zip(names, values))
+            for values in itertools.product(*(grid[name] for name in names))]
+
+
+def _run_case(case: dict, common: dict):
+    # Results travel through the cache, not through the pickled return value.
+    generate_cfd_kolmogorov_flow(**common, **case, use_cache=True, plot_series=False)
+    return case
+
+
+def _check_args(cases, common):
+    for args in (common, *cases):
+        fixed = [name for name in _FIXED_ARGS if name in args]
+        if fixed:
+            raise TypeError(f"the sweep always reads and writes the flow cache without "
+                            f"plotting; {fixed} cannot be passed")
+
+
+def _run_cases(cases, common, n_workers, fftw_threads, use_mpi):
+    """Run every case once in a worker pool; the results land in the cache."""
+    if use_mpi:
+        # The workers are MPI ranks that are already running, so only the
+        # initializer can limit their thread pools.
+        from mpi4py.futures import MPIPoolExecutor
+        executor = MPIPoolExecutor(max_workers=n_workers, initializer=limit_threads,
+                                   initargs=(fftw_threads,))
+        with executor:
+            list(executor.map(_run_case, cases, itertools.repeat(common)))
+        return
+
+    if n_workers is None:
+        n_workers = max(1, (os.cpu_count() or 1) // fftw_threads)
+    with thread_env(fftw_threads):
+        # spawn: forked workers would inherit FFTW plans and thread pools
+        executor = ProcessPoolExecutor(max_workers=n_workers,
+                                       mp_context=mp.get_context("spawn"),
+                                       initializer=limit_threads, initargs=(fftw_threads,))
+        futures = [executor.submit(_run_case, case, common) for case in cases]
+    with executor:
+        for future in futures:
+            future.result()
+
+
+def sweep_kolmogorov_flow(param_grid,
+                          n_workers: int = None,
+                          fftw_threads: int = 1,
+                          use_mpi: bool = False,
+                          cache_dir: Path = CACHE_DIR,
+                          **common):
+    """
+    Generate a Kolmogorov flow ensemble in parallel.
+
+    Parameters
+    ----------
+    param_grid : dict or list of dict
+        Either {name: [values, ...]} (expanded with `parameter_grid`) or an
+        explicit list of cases. Each case holds keyword arguments of
+        `generate_cfd_kolmogorov_flow`, e.g. nu, forcing_amp, kf.
+    n_workers : int
+        Number of worker processes, by default cpu_count // fftw_threads.
+    fftw_threads : int
+        FFTW/BLAS threads per worker, so that workers do not oversubscribe
+        the machine.
+    use_mpi : bool
+        Fan the cases out to MPI ranks through mpi4py.futures instead of a
+        local process pool. The script must then be started as
+        `mpiexec -n N python -m mpi4py.futures script.py`, so that only the
+        root runs it and the other ranks serve as workers; under a plain
+        `mpirun` every rank would run the whole sweep.
+    **common
+        Arguments shared by every case (n_timesteps, nx, ny, dt, ...).
+
+    Every worker writes its trajectory to the shared flow cache, whose
+    atomic publication makes concurrent writers safe. Cases that are
+    already cached are served without recomputation.
+
+    Returns
+    -------
+    list of (case, (u_field, v_field)) in grid order; the fields are
+    read-only memory maps into the cache.
+    """
+    cases = parameter_grid(param_grid) if isinstance(param_grid, dict) else list(param_grid)
+    _check_args(cases, common)
+    common = dict(common, cache_dir=cache_dir)
+    _run_cases(cases, common, n_workers, fftw_threads, use_mpi)
+
+    return [(case, generate_cfd_kolmogorov_flow(**common, **case, use_cache=True))
+            for case in cases]
+
+
+def warm_kolmogorov_cache(seeds,
+                          comm=None,
+                          n_workers: int = None,
+                          fftw_threads: int = 1,
+                          cache_dir: Path = CACHE_DIR,
+                          **params):
+    """
+    Precompute the trajectories of a seed range once so that every worker
+    sharing `cache_dir` is served from the cache afterwards.
+
+    With an mpi4py communicator, rank r computes seeds[r::size] and all ranks
+    wait for each other before returning, so the whole ensemble is
+    available everywhere on return. Without one, the seeds are spread over a
+    local process pool as in `sweep_kolmogorov_flow`. `params` are the
+    arguments shared by every seed (n_timesteps, nx, ny, nu, ...).
+    """
+    cases = [dict(seed=int(seed)) for seed in seeds]
+    _check_args(cases, params)
+    common = dict(params, cache_dir=cache_dir)
+
+    if comm is None:
+        _run_cases(cases, common, n_workers, fftw_threads, use_mpi=False)
+        return
+
+    limit_threads(fftw_threads)
+    for case in cases[comm.Get_rank()::comm.Get_size()]:
+        _run_case(case, common)
+    comm.Barrier()
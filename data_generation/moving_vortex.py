@@ -1,8 +1,157 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from .chunking import block_size, check_out, time_chunks
+from .flow_cache import CACHE_DIR, get_cache
 
-def generate_moving_vortex(n_timesteps, nx, ny, lx=1, ly=1, period=100, plot_series=False, plot_interval=1):
+_CACHE_VERSION = 1
+
+
+def _fill_vortices(x, y, gammas, core_radii, centers, u_out, v_out):
+    """
+    Superpose N Lamb–Oseen vortices on the (x, y) grid for a block of
+    timesteps and write the result into `u_out`, `v_out` (shape (tb, nx, ny)).
+
+    `centers` has shape (tb, N, 2). Vortices are added one at a time, so the
+    scratch footprint is a few (tb, nx, ny) arrays regardless of N.
+    """
+    dtype = u_out.dtype
+    u_out[...] = 0
+    v_out[...] = 0
+    r2 = np.empty(u_out.shape, dtype=dtype)
+    factor = np.empty_like(r2)
+    q = np.empty_like(r2)
+
+    for k in range(len(gammas)):
+        dx = (x[None, :, None] - centers[:, k, 0, None, None]).astype(dtype, copy=False)
+        dy = (y[None, None, :] - centers[:, k, 1, None, None]).astype(dtype, copy=False)
+        np.add(dx**2, dy**2, out=r2)
+        # Avoid division by zero:
+        r2[r2 == 0] = 1e-10
+
+        # factor = 1 - exp(-r²/r_c²)
+        np.negative(r2, out=factor)
+        factor /= core_radii[k]**2
+        np.exp(factor, out=factor)
+        np.subtract(1, factor, out=factor)
+
+        coef = gammas[k] / (2 * np.pi)
+        np.divide(dy, r2, out=q)
+        q *= coef
+        q *= factor
+        u_out -= q
+        np.divide(dx, r2, out=q)
+        q *= coef
+        q *= factor
+        v_out += q
+
+
+def _vortex_arrays(centers, gammas, core_radii):
+    centers = np.asarray(centers, dtype=np.float64)
+    if centers.ndim != 3 or centers.shape[2] != 2:
+        raise ValueError(f"centers must have shape (n_timesteps, n_vortices, 2), got {centers.shape}")
+    n_vortices = centers.shape[1]
+    gammas = np.broadcast_to(np.asarray(gammas, dtype=np.float64), (n_vortices,))
+    core_radii = np.broadcast_to(np.asarray(core_radii, dtype=np.float64), (n_vortices,))
+    return centers, gammas, core_radii
+
+
+def circular_orbit(n_timesteps, period=100, x_center=0.5, y_center=0.5, r_move=0.3):
+    """
+    Center trajectory of a single vortex moving on a circle, shape
+    (n_timesteps, 1, 2). This is the orbit used by `generate_moving_vortex`.
+    """
+    theta = 2 * np.pi * np.arange(n_timesteps) / period
+    centers = np.empty((n_timesteps, 1, 2))
+    centers[:, 0, 0] = x_center + r_move * np.cos(theta)
+    centers[:, 0, 1] = y_center + r_move * np.sin(theta)
+    return centers
+
+
+def generate_multi_vortex(centers, nx, ny, gammas=1.0, core_radii=0.1, lx=1, ly=1,
+                          dtype=np.float64, out=None, use_cache=False, cache_dir=CACHE_DIR):
+    """
+    Superpose N Lamb–Oseen vortices moving along prescribed trajectories:
+
+        u(x,y,t) = - Σ_k (Gamma_k/(2π)) * ( (y - y_k(t)) / r_k² ) * [1 - exp(-r_k²/r_c,k²)]
+        v(x,y,t) =   Σ_k (Gamma_k/(2π)) * ( (x - x_k(t)) / r_k² ) * [1 - exp(-r_k²/r_c,k²)]
+
+    Parameters:
+      centers : array of shape (n_timesteps, n_vortices, 2) with the (x, y)
+          position of every vortex center at every timestep.
+      nx, ny : Number of spatial grid points in x and y directions.
+      gammas : Circulation of each vortex, scalar or shape (n_vortices,).
+      core_radii : Core radius r_c of each vortex, scalar or shape (n_vortices,).
+      dtype : Floating point type of the returned fields.
+      out : Optional (u_out, v_out) pair of preallocated arrays of shape
+          (n_timesteps, nx, ny). Their dtype overrides `dtype`.
+      use_cache : Serve the fields from the shared flow cache (read-only
+          memory maps), generating and storing them on a miss.
+      cache_dir : Cache directory or a configured FlowCache.
+
+    The fields are evaluated in time blocks, one vortex at a time, so memory
+    is the output plus O(n_timesteps * n_vortices) for the trajectories.
+
+    Returns:
+       u_field, v_field
+    """
+    centers, gammas, core_radii = _vortex_arrays(centers, gammas, core_radii)
+    n_timesteps = centers.shape[0]
+    shape = (n_timesteps, nx, ny)
+    if out is not None:
+        check_out(out, shape)
+        dtype = out[0].dtype
+
+    if use_cache:
+        params = dict(centers=centers, nx=nx, ny=ny, gammas=gammas, core_radii=core_radii,
+                      lx=lx, ly=ly, dtype=np.dtype(dtype).name)
+        u_field, v_field = get_cache(cache_dir).fetch(
+            "multi_vortex", _CACHE_VERSION, params,
+            lambda: generate_multi_vortex(centers, nx, ny, gammas, core_radii, lx, ly, dtype=dtype))
+        if out is not None:
+            np.copyto(out[0], u_field)
+            np.copyto(out[1], v_field)
+            u_field, v_field = out
+        return u_field, v_field
+
+    if out is None:
+        u_field = np.empty(shape, dtype=dtype)
+        v_field = np.empty(shape, dtype=dtype)
+    else:
+        u_field, v_field = out
+
+    x = np.linspace(0, lx, nx)
+    y = np.linspace(0, ly, ny)
+    for t_slice in time_chunks(n_timesteps, block_size(nx, ny)):
+        _fill_vortices(x, y, gammas, core_radii, centers[t_slice],
+                       u_field[t_slice], v_field[t_slice])
+
+    return u_field, v_field
+
+
+def iter_multi_vortex_chunks(centers, nx, ny, chunk_size, gammas=1.0, core_radii=0.1,
+                             lx=1, ly=1, dtype=np.float64):
+    """
+    Streaming variant of `generate_multi_vortex`.
+
+    Yields `(t_slice, u_chunk, v_chunk)` blocks of at most `chunk_size`
+    timesteps. Concatenating the chunks along axis 0 reproduces the eager
+    result bit for bit.
+    """
+    centers, gammas, core_radii = _vortex_arrays(centers, gammas, core_radii)
+    x = np.linspace(0, lx, nx)
+    y = np.linspace(0, ly, ny)
+
+    for t_slice in time_chunks(centers.shape[0], chunk_size):
+        n = t_slice.stop - t_slice.start
+        u_chunk = np.empty((n, nx, ny), dtype=dtype)
+        v_chunk = np.empty((n, nx, ny), dtype=dtype)
+        _fill_vortices(x, y, gammas, core_radii, centers[t_slice], u_chunk, v_chunk)
+        yield t_slice, u_chunk, v_chunk
+
+
+def generate_moving_vortex(n_timesteps, nx, ny, lx=1, ly=1, period=100, plot_series=False, plot_interval=1,
+                           use_cache=False, cache_dir=CACHE_DIR):
     """
     Generate a moving vortex flow field based on the Lamb–Oseen vortex solution.
     The instantaneous velocity field is computed as:
@@ -11,51 +160,25 @@ def generate_moving_vortex(n_timesteps, nx, ny, lx=1, ly=1, period=100, plot_ser
         v(x,y,t) =   (Gamma/(2π)) * ( (x - x0(t)) / r² ) * [1 - exp(-r²/r_c²)]
         
     where r² = (x - x0(t))² + (y - y0(t))².
+
+    This is the single-vortex case of `generate_multi_vortex` with Gamma = 1,
+    r_c = 0.1 and the center on `circular_orbit(n_timesteps, period)`.
     """
-    # Vortex parameters
-    Gamma = 1.0
-    r_c = 0.1
-    x_center = 0.5
-    y_center = 0.5
-    r_move = 0.3  # amplitude of the center's circular motion
-
-    data = np.zeros((n_timesteps, nx, ny))
-    u_field = np.zeros((n_timesteps, nx, ny))
-    v_field = np.zeros((n_timesteps, nx, ny))
-    
-    # Define physical domain: x in [0,lx], y in [0,ly]
-    x = np.linspace(0, lx, nx)
-    y = np.linspace(0, ly, ny)
-    # Use 'ij' indexing: first index corresponds to x, second to y.
-    Xgrid, Ygrid = np.meshgrid(x, y, indexing='ij')
-    
-    for t in range(n_timesteps):
-        theta = 2 * np.pi * t / period
-        x0 = x_center + r_move * np.cos(theta)
-        y0 = y_center + r_move * np.sin(theta)
-        
-        dx = Xgrid - x0
-        dy = Ygrid - y0
-        r2 = dx**2 + dy**2
-        # Avoid division by zero:
-        r2[r2 == 0] = 1e-10
-        
-        factor = 1 - np.exp(-r2 / (r_c**2))
-        u = - (Gamma / (2 * np.pi)) * (dy / r2) * factor
-        v =   (Gamma / (2 * np.pi)) * (dx / r2) * factor
-        
-        u_field[t] = u
-        v_field[t] = v
-        data[t] = np.sqrt(u**2 + v**2)
-    
+    u_field, v_field = generate_multi_vortex(circular_orbit(n_timesteps, period),
+                                             nx, ny, gammas=1.0, core_radii=0.1,
+                                             lx=lx, ly=ly, use_cache=use_cache,
+                                             cache_dir=cache_dir)
+
     if plot_series:
+        # Use 'ij' indexing: first index corresponds to x, second to y.
+        Xgrid, Ygrid = np.meshgrid(np.linspace(0, lx, nx), np.linspace(0, ly, ny), indexing='ij')
         fig, axes = plt.subplots(1, n_timesteps, figsize=(4 * n_timesteps, 4))
         for t in range(0, n_timesteps, plot_interval):
             ax = axes[t]
             
-            # Since data[t] is stored as (nx, ny) with x in axis 0 and y in axis 1,
+            # Since the speed is stored as (nx, ny) with x in axis 0 and y in axis 1,
             # we transpose it so that imshow interprets the first dimension as y (vertical)
-            im = ax.imshow(data[t].T, origin='lower', extent=[0,lx,0,ly], cmap='viridis')
+            im = ax.imshow(np.sqrt(u_field[t]**2 + v_field[t]**2).T, origin='lower', extent=[0,lx,0,ly], cmap='viridis')
             plt.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
 
             # The quiver uses Xgrid and Ygrid from meshgrid with indexing='ij',
@@ -70,5 +193,17 @@ def generate_moving_vortex(n_timesteps, nx, ny, lx=1, ly=1, period=100, plot_ser
     return u_field, v_field
 
 
+def iter_moving_vortex_chunks(n_timesteps, nx, ny, chunk_size, lx=1, ly=1, period=100):
+    """
+    Streaming variant of `generate_moving_vortex`.
+
+    Yields `(t_slice, u_chunk, v_chunk)` blocks of at most `chunk_size`
+    timesteps. Concatenating the chunks along axis 0 reproduces the eager
+    result bit for bit.
+    """
+    return iter_multi_vortex_chunks(circular_orbit(n_timesteps, period), nx, ny, chunk_size,
+                                    gammas=1.0, core_radii=0.1, lx=lx, ly=ly)
+
+
 if __name__ == "__main__":
-    _ = generate_moving_vortex(5, 100, 50, plot_series=True, plot_interval=1)
\ No newline at end of file
+    _ = generate_moving_vortex(5, 100, 50, plot_series=True, plot_interval=1)
@@ -1,17 +1,53 @@
 import numpy as np
 
+from .chunking import block_size, time_chunks
+from .flow_cache import CACHE_DIR, get_cache
 
-def generate_simple_flow(n_timesteps, nx, ny):
+_CACHE_VERSION = 1
+
+
+def _fill_simple_flow(times, n_timesteps, x, y, out):
+    """Write the Gaussian blob at every time in `times` into `out`."""
+    # The center of the blob moves linearly through the domain.
+    cx = 0.8 - 0.6 * (np.asarray(times) / n_timesteps)
+    cy = 0.2 + 0.6 * (np.asarray(times) / n_timesteps)
+    out[...] = np.exp(-((x[None, :, None] - cx[:, None, None])**2
+                        + (y[None, None, :] - cy[:, None, None])**2) / 0.01)
+
+
+def generate_simple_flow(n_timesteps, nx, ny, use_cache=False, cache_dir=CACHE_DIR):
     # create a moving Gaussian "blob" that travels across the domain.
+    if use_cache:
+        params = dict(n_timesteps=n_timesteps, nx=nx, ny=ny)
+        data, = get_cache(cache_dir).fetch(
+            "simple_flow", _CACHE_VERSION, params,
+            lambda: (generate_simple_flow(n_timesteps, nx, ny),), names=("data",))
+        return data
+
     data = np.zeros((n_timesteps, nx, ny))
     x = np.linspace(0, 1, nx)
     y = np.linspace(0, 1, ny)
-    Xgrid, Ygrid = np.meshgrid(x, y, indexing='ij')
 
-    for t in range(n_timesteps):
-        # The center of the blob moves linearly through the domain.
-        cx = 0.8 - 0.6 * (t / n_timesteps)
-        cy = 0.2 + 0.6 * (t / n_timesteps)
-        data[t] = np.exp(-((Xgrid - cx)**2 + (Ygrid - cy)**2) / 0.01)
+    for t_slice in time_chunks(n_timesteps, block_size(nx, ny)):
+        _fill_simple_flow(np.arange(t_slice.start, t_slice.stop), n_timesteps,
+                          x, y, data[t_slice])
+
+    return data
+
+
+def iter_simple_flow_chunks(n_timesteps, nx, ny, chunk_size):
+    """
+    Streaming variant of `generate_simple_flow`.
+
+    The blob is a scalar field, so this yields `(t_slice, data_chunk)` blocks
+    of at most `chunk_size` timesteps. Concatenating the chunks along axis 0
+    reproduces the eager result bit for bit.
+    """
+    x = np.linspace(0, 1, nx)
+    y = np.linspace(0, 1, ny)
 
-    return data
\ No newline at end of file
+    for t_slice in time_chunks(n_timesteps, chunk_size):
+        data_chunk = np.empty((t_slice.stop - t_slice.start, nx, ny))
+        _fill_simple_flow(np.arange(t_slice.start, t_slice.stop), n_timesteps,
+                          x, y, data_chunk)
+        yield t_slice, data_chunk
@@ -0,0 +1,292 @@
+import json, os, threading, zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+_FORMAT_VERSION = 1
+
+
+def _encode(chunk, level):
+    """Byte-shuffle (all first bytes, then all second bytes, ...) and deflate."""
+    if level is None:
+        return chunk.tobytes()
+    shuffled = chunk.reshape(-1).view(np.uint8).reshape(-1, chunk.itemsize).T
+    return zlib.compress(np.ascontiguousarray(shuffled).tobytes(), level)
+
+
+def _decode(raw, shape, dtype, level):
+    dtype = np.dtype(dtype)
+    if level is None:
+        return np.frombuffer(raw, dtype=dtype).reshape(shape)
+    shuffled = np.frombuffer(zlib.decompress(raw), dtype=np.uint8)
+    return (shuffled.reshape(dtype.itemsize, -1).T.copy()
+            .view(dtype).reshape(shape))
+
+
+def _write_atomic(path, data):
+    tmp = path.with_name(f".tmp-{path.name}-{threading.get_ident()}")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class SnapshotArray:
+    """
+    Read access to one field of a `SnapshotStore`.
+
+    `field[t0:t1, x0:x1, y0:y1]` only reads and decompresses the chunks
+    that overlap the window; missing chunks read as NaN.
+    """
+
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+
+    @property
+    def shape(self):
+        return (self.store.n_timesteps, *self.store.grid_shape)
+
+    @property
+    def dtype(self):
+        return self.store.dtype
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if len(key) > 3:
+            raise IndexError(f"too many indices for a 3-d field: {key}")
+        key = key + (slice(None),) * (3 - len(key))
+
+        # Read the bounding box of the request, then apply steps and
+        # integer indices to it with plain numpy indexing.
+        bounds, post = [], []
+        for k, n in zip(key, self.shape):
+            if isinstance(k, slice):
+                start, stop, step = k.indices(n)
+                if step < 0:
+                    # the box ends at `start`, which [::step] visits first
+                    start, stop = stop + 1, start + 1
+                stop = max(start, stop)
+                post.append(slice(None, None, step))
+            else:
+                k = int(k) + n if int(k) < 0 else int(k)
+                if not 0 <= k < n:
+                    raise IndexError(f"index {k} is out of bounds for size {n}")
+                start, stop = k, k + 1
+                post.append(0)
+            bounds.append((start, stop))
+        return self._read_box(bounds)[tuple(post)]
+
+    def _read_box(self, bounds):
+        store = self.store
+        out = np.full([stop - start for start, stop in bounds], np.nan, dtype=store.dtype)
+        ranges = [range(start // c, -(-stop // c))
+                  for (start, stop), c in zip(bounds, store.chunks)]
+        for ct in ranges[0]:
+            for cx in ranges[1]:
+                for cy in ranges[2]:
+                    index = (ct, cx, cy)
+                    chunk = store.read_chunk(self.name, index)
+                    if chunk is None:
+                        continue
+                    src, dst = [], []
+                    for i, (start, stop), c, n in zip(index, bounds, store.chunks, chunk.shape):
+                        lo, hi = max(start, i * c), min(stop, i * c + n)
+                        src.append(slice(lo - i * c, hi - i * c))
+                        dst.append(slice(lo - start, hi - start))
+                    out[tuple(dst)] = chunk[tuple(src)]
+        return out
+
+
+class SnapshotStore:
+    """
+    Chunked, optionally compressed on-disk store of (T, nx, ny) snapshot
+    fields that grow along time, laid out like a Zarr array:
+
+        path/meta.json          shape, chunk shape, dtype, compression, attrs
+        path/<field>/<t>.<x>.<y>  one file per chunk
+        path/<name>.npy         extra arrays (time stamps, validity mask, ...)
+
+    Snapshots are appended from the time loop with `append`; every time
+    chunk that fills up is compressed and written by background threads,
+    so the caller only pays for a copy into the chunk buffer. `flush`
+    writes the partial last chunk and publishes the new length in
+    meta.json. Readers (`store["u"][t0:t1, x0:x1, y0:y1]`) only touch the
+    chunks that overlap the requested window.
+
+    Parameters
+    ----------
+    path : directory of the store.
+    grid_shape : (nx, ny) of one snapshot.
+    fields : names of the stored fields.
+    chunks : (ct, cx, cy) chunk shape.
+    dtype : storage precision, float32 by default.
+    level : zlib level, or None to store raw chunks.
+    max_pending : time chunks that may wait for the writer threads before
+        `append` blocks, which bounds the memory held by the queue.
+    """
+
+    def __init__(self, path, grid_shape=None, fields=("u", "v"), chunks=(32, 128, 128),
+                 dtype=np.float32, level=1, attrs=None, n_threads=2, max_pending=4):
+        self.path = Path(path)
+        meta_file = self.path / "meta.json"
+        if meta_file.exists():
+            meta = json.loads(meta_file.read_text())
+        else:
+            if grid_shape is None:
+                raise FileNotFoundError(f"no snapshot store at {self.path}")
+            meta = dict(version=_FORMAT_VERSION, n_timesteps=0,
+                        grid_shape=[int(n) for n in grid_shape], fields=list(fields),
+                        chunks=[int(c) for c in chunks], dtype=np.dtype(dtype).name,
+                        level=level, attrs=attrs or {})
+            for name in meta["fields"]:
+                (self.path / name).mkdir(parents=True, exist_ok=True)
+            _write_atomic(meta_file, json.dumps(meta).encode())
+
+        self.n_timesteps = meta["n_timesteps"]
+        self.grid_shape = tuple(meta["grid_shape"])
+        self.fields = list(meta["fields"])
+        self.chunks = tuple(meta["chunks"])
+        self.dtype = np.dtype(meta["dtype"])
+        self.level = meta["level"]
+        self.attrs = meta["attrs"]
+
+        self._n_threads = n_threads
+        self._max_pending = max_pending
+        self._executor = None
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._buffers = None
+        self._buffer_start = self.n_timesteps
+
+    @classmethod
+    def open(cls, path, **kwargs):
+        """Open an existing store for reading or appending."""
+        return cls(path, **kwargs)
+
+    def __getitem__(self, name):
+        if name not in self.fields:
+            raise KeyError(name)
+        return SnapshotArray(self, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def chunk_path(self, name, index):
+        return self.path / name / ".".join(str(i) for i in index)
+
+    def read_chunk(self, name, index):
+        try:
+            raw = self.chunk_path(name, index).read_bytes()
+        except FileNotFoundError:
+            return None
+        _, cx, cy = self.chunks
+        _, x, y = index
+        # The last time row may be partial (or fuller than meta.json says
+        # while a writer is running), so its length comes from the data.
+        shape = (-1, min(cx, self.grid_shape[0] - x * cx),
+                 min(cy, self.grid_shape[1] - y * cy))
+        return _decode(raw, shape, self.dtype, self.level)
+
+    def _write_time_chunk(self, ct_index, buffers, n):
+        """Split one (n, nx, ny) time slab per field into chunk files."""
+        _, cx, cy = self.chunks
+        nx, ny = self.grid_shape
+        for name, buf in zip(self.fields, buffers):
+            for x in range(0, nx, cx):
+                for y in range(0, ny, cy):
+                    chunk = np.ascontiguousarray(buf[:n, x:x + cx, y:y + cy])
+                    _write_atomic(self.chunk_path(name, (ct_index, x // cx, y // cy)),
+                                  _encode(chunk, self.level))
+
+    def _write_meta(self):
+        meta = dict(version=_FORMAT_VERSION, n_timesteps=self.n_timesteps,
+                    grid_shape=list(self.grid_shape), fields=self.fields,
+                    chunks=list(self.chunks), dtype=self.dtype.name,
+                    level=self.level, attrs=self.attrs)
+        with self._lock:
+            _write_atomic(self.path / "meta.json", json.dumps(meta).encode())
+
+    def _submit(self, ct_index, buffers, n):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._n_threads)
+        while len(self._pending) >= self._max_pending:
+            self._pending.popleft().result()
+        self._pending.append(self._executor.submit(self._write_time_chunk, ct_index, buffers, n))
+
+    def _load_buffers(self):
+        """Time-chunk buffers, pre-filled with a partial last chunk if there is one."""
+        ct = self.chunks[0]
+        self._buffers = [np.empty((ct, *self.grid_shape), dtype=self.dtype)
+                         for _ in self.fields]
+        self._buffer_start = self.n_timesteps - self.n_timesteps % ct
+        n_filled = self.n_timesteps - self._buffer_start
+        if n_filled:
+            for name, buf in zip(self.fields, self._buffers):
+                buf[:n_filled] = self[name][self._buffer_start:self.n_timesteps]
+
+    def append(self, *arrays, **named):
+        """
+        Append snapshots, given in `fields` order or by name, each of shape
+        (n, nx, ny) or (nx, ny). Returns as soon as they are copied.
+        """
+        if named:
+            arrays = tuple(named[name] for name in self.fields)
+        if len(arrays) != len(self.fields):
+            raise ValueError(f"expected {len(self.fields)} fields {self.fields}, "
+                             f"got {len(arrays)}")
+        arrays = [a[None] if a.ndim == 2 else a for a in map(np.asarray, arrays)]
+        n = len(arrays[0])
+        if any(a.shape != (n, *self.grid_shape) for a in arrays):
+            raise ValueError(f"every field must have shape ({n}, {self.grid_shape}), "
+                             f"got {[a.shape for a in arrays]}")
+        if self._buffers is None:
+            self._load_buffers()
+
+        ct = self.chunks[0]
+        done = 0
+        while done < n:
+            offset = self.n_timesteps - self._buffer_start
+            take = min(ct - offset, n - done)
+            for buf, a in zip(self._buffers, arrays):
+                buf[offset:offset + take] = a[done:done + take]
+            done += take
+            self.n_timesteps += take
+            if self.n_timesteps - self._buffer_start == ct:
+                # hand the full buffers to the writers and start fresh ones
+                self._submit(self._buffer_start // ct, self._buffers, ct)
+                self._buffers = [np.empty_like(buf) for buf in self._buffers]
+                self._buffer_start = self.n_timesteps
+
+    def flush(self):
+        """Write the partial time chunk, wait for pending writes, update meta.json."""
+        if self._buffers is not None and self.n_timesteps > self._buffer_start:
+            n = self.n_timesteps - self._buffer_start
+            self._submit(self._buffer_start // self.chunks[0],
+                         [buf.copy() for buf in self._buffers], n)
+        while self._pending:
+            self._pending.popleft().result()
+        self._write_meta()
+
+    def close(self):
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def save_array(self, name, arr):
+        """Store a small side array such as time stamps or the validity mask."""
+        tmp = self.path / f".tmp-{name}.npy"
+        np.save(tmp, arr)
+        os.replace(tmp, self.path / f"{name}.npy")
+
+    def load_array(self, name):
+        return np.load(self.path / f"{name}.npy")
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from data_generation import (generate_double_gyre_flow, generate_moving_vortex,
+                             generate_multi_vortex, generate_simple_flow,
+                             iter_double_gyre_chunks, iter_moving_vortex_chunks,
+                             iter_multi_vortex_chunks, iter_simple_flow_chunks)
+from data_generation.chunking import time_chunks
+from data_generation.moving_vortex import circular_orbit
+
+
+def _concatenate(chunks, n_timesteps):
+    chunks = list(chunks)
+    starts = [t_slice.start for t_slice, *_ in chunks]
+    assert starts == list(range(0, n_timesteps, len(chunks[0][1])))
+    return [np.concatenate(blocks) for blocks in zip(*(arrays for _, *arrays in chunks))]
+
+
+def test_time_chunks():
+    assert list(time_chunks(7, 3)) == [slice(0, 3), slice(3, 6), slice(6, 7)]
+    assert list(time_chunks(0, 3)) == []
+    with pytest.raises(ValueError):
+        list(time_chunks(7, 0))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 50])
+def test_double_gyre(chunk_size):
+    eager = generate_double_gyre_flow(11, 9, 6, epsilon=0.4, period=7)
+    chunks = iter_double_gyre_chunks(11, 9, 6, chunk_size, epsilon=0.4, period=7)
+    for a, b in zip(_concatenate(chunks, 11), eager):
+        assert a.dtype == b.dtype
+        np.testing.assert_array_equal(a, b)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 50])
+def test_moving_vortex(chunk_size):
+    eager = generate_moving_vortex(11, 9, 6, period=5)
+    for a, b in zip(_concatenate(iter_moving_vortex_chunks(11, 9, 6, chunk_size, period=5), 11),
+                    eager):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_multi_vortex():
+    centers = np.concatenate([circular_orbit(10, 5), circular_orbit(10, 7, r_move=0.2)], axis=1)
+    eager = generate_multi_vortex(centers, 9, 6, gammas=[1.0, -0.5], core_radii=[0.1, 0.2])
+    chunks = iter_multi_vortex_chunks(centers, 9, 6, 3, gammas=[1.0, -0.5],
+                                      core_radii=[0.1, 0.2])
+    for a, b in zip(_concatenate(chunks, 10), eager):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_simple_flow():
+    eager = generate_simple_flow(11, 9, 6)
+    data, = _concatenate(iter_simple_flow_chunks(11, 9, 6, 4), 11)
+    np.testing.assert_array_equal(data, eager)
+
+
+def test_simple_flow_matches_loop():
+    # the original one-timestep-at-a-time formulation
+    n_timesteps, nx, ny = 11, 9, 6
+    Xgrid, Ygrid = np.meshgrid(np.linspace(0, 1, nx), np.linspace(0, 1, ny), indexing='ij')
+    ref = np.zeros((n_timesteps, nx, ny))
+    for t in range(n_timesteps):
+        cx = 0.8 - 0.6 * (t / n_timesteps)
+        cy = 0.2 + 0.6 * (t / n_timesteps)
+        ref[t] = np.exp(-((Xgrid - cx)**2 + (Ygrid - cy)**2) / 0.01)
+    np.testing.assert_allclose(generate_simple_flow(n_timesteps, nx, ny), ref, rtol=1e-12)
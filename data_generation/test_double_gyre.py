@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from data_generation import generate_double_gyre_flow
+
+
+def _loop_double_gyre(n_timesteps, nx, ny, lx=2, ly=1, A=0.1, epsilon=0.25, period=20):
+    # the original one-timestep-at-a-time formulation
+    omega = 2*np.pi / period
+    u_field = np.zeros((n_timesteps, nx, ny))
+    v_field = np.zeros((n_timesteps, nx, ny))
+    Xgrid, Ygrid = np.meshgrid(np.linspace(0, lx, nx), np.linspace(0, ly, ny), indexing='ij')
+    for t in range(n_timesteps):
+        sin_omega_t = np.sin(omega * t)
+        f = epsilon * sin_omega_t * Xgrid**2 + (1 - 2*epsilon*sin_omega_t) * Xgrid
+        dfdx = 2 * epsilon * sin_omega_t * Xgrid + (1 - 2*epsilon*sin_omega_t)
+        u_field[t] = - np.pi * A * np.sin(np.pi * f) * np.cos(np.pi * Ygrid)
+        v_field[t] = np.pi * A * np.cos(np.pi * f) * np.sin(np.pi * Ygrid) * dfdx
+    return u_field, v_field
+
+
+@pytest.mark.parametrize("dtype, rtol", [(np.float64, 1e-12), (np.float32, 1e-5)])
+def test_matches_loop(dtype, rtol):
+    u_ref, v_ref = _loop_double_gyre(25, 17, 9, epsilon=0.4, period=7)
+    u, v, speed = generate_double_gyre_flow(25, 17, 9, epsilon=0.4, period=7, dtype=dtype,
+                                            return_magnitude=True)
+    assert u.dtype == v.dtype == dtype
+    np.testing.assert_allclose(u, u_ref, rtol=rtol, atol=rtol * 0.1 * np.pi)
+    np.testing.assert_allclose(v, v_ref, rtol=rtol, atol=rtol * 0.1 * np.pi)
+    np.testing.assert_allclose(speed, np.hypot(u_ref, v_ref), rtol=rtol, atol=rtol)
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_out(tmp_path, use_cache):
+    ref = generate_double_gyre_flow(6, 8, 5, dtype=np.float64)
+    out = (np.empty((6, 8, 5)), np.empty((6, 8, 5)))
+    u, v = generate_double_gyre_flow(6, 8, 5, out=out, use_cache=use_cache, cache_dir=tmp_path)
+    assert u is out[0] and v is out[1]
+    np.testing.assert_array_equal(u, ref[0])
+    np.testing.assert_array_equal(v, ref[1])
+
+    with pytest.raises(ValueError):
+        generate_double_gyre_flow(6, 8, 5, out=(np.empty((6, 5, 8)), np.empty((6, 5, 8))),
+                                  use_cache=use_cache, cache_dir=tmp_path)
+    with pytest.raises(ValueError):
+        generate_double_gyre_flow(6, 8, 5, out=(out[0], out[1].astype(np.float32)),
+                                  use_cache=use_cache, cache_dir=tmp_path)
@@ -0,0 +1,88 @@
+import os
+
+import numpy as np
+import pytest
+
+from data_generation import FlowCache, generate_simple_flow
+from data_generation.flow_cache import cache_key
+
+
+def test_store_and_load_are_read_only_maps(tmp_path):
+    cache = FlowCache(tmp_path)
+    params = dict(n=3, dtype=np.float32)
+    assert cache.load("flow", 1, params) is None
+    u = np.arange(12.0).reshape(3, 4)
+    stored = cache.store("flow", 1, params, dict(u_field=u))
+    loaded = cache.load("flow", 1, params)
+    for arrays in (stored, loaded):
+        assert isinstance(arrays["u_field"], np.memmap)
+        np.testing.assert_array_equal(arrays["u_field"], u)
+    with pytest.raises(ValueError):
+        loaded["u_field"][0, 0] = 1
+
+
+def test_key_depends_on_version_and_parameters():
+    params = dict(n=3, grid=np.zeros(4))
+    key = cache_key("flow", 1, params)
+    assert key == cache_key("flow", 1, dict(grid=np.zeros(4), n=3))
+    assert key != cache_key("flow", 2, params)
+    assert key != cache_key("flow", 1, dict(params, n=4))
+    assert key != cache_key("flow", 1, dict(params, grid=np.ones(4)))
+
+
+def test_fetch_computes_once(tmp_path):
+    cache = FlowCache(tmp_path)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return np.ones((2, 3)), np.zeros((2, 3))
+
+    first = cache.fetch("flow", 1, dict(n=2), compute)
+    second = cache.fetch("flow", 1, dict(n=2), compute)
+    assert len(calls) == 1
+    np.testing.assert_array_equal(first[0], second[0])
+    np.testing.assert_array_equal(second[1], 0)
+
+
+def test_store_chunks_matches_full_array(tmp_path):
+    cache = FlowCache(tmp_path)
+    u = np.random.default_rng(0).standard_normal((10, 4, 5)).astype(np.float32)
+    chunks = ((slice(s, s + 3), u[s:s + 3], -u[s:s + 3]) for s in range(0, 10, 3))
+    arrays = cache.store_chunks("flow", 1, {}, ("u_field", "v_field"), u.shape,
+                                np.float32, chunks)
+    np.testing.assert_array_equal(arrays["u_field"], u)
+    np.testing.assert_array_equal(arrays["v_field"], -u)
+    assert not [p for p in tmp_path.iterdir() if p.name.startswith(".tmp-")]
+
+
+def test_evicts_least_recently_used(tmp_path):
+    size = np.zeros(1000).nbytes
+    cache = FlowCache(tmp_path, max_bytes=int(2.5 * size))
+    for n in range(2):
+        cache.store("flow", 1, dict(n=n), dict(u_field=np.full(1000, float(n))))
+    for n, mtime in ((0, 1.5e9), (1, 1e9)):      # 0 was used after 1
+        os.utime(cache.entry_dir("flow", cache_key("flow", 1, dict(n=n))), (mtime, mtime))
+    cache.store("flow", 1, dict(n=2), dict(u_field=np.full(1000, 2.0)))
+    assert cache.load("flow", 1, dict(n=1)) is None
+    assert cache.load("flow", 1, dict(n=0)) is not None
+    assert cache.load("flow", 1, dict(n=2)) is not None
+
+
+def test_generator_cache_matches_direct_call(tmp_path):
+    direct = generate_simple_flow(6, 8, 5)
+    cached = generate_simple_flow(6, 8, 5, use_cache=True, cache_dir=tmp_path)
+    again = generate_simple_flow(6, 8, 5, use_cache=True, cache_dir=FlowCache(tmp_path))
+    np.testing.assert_array_equal(cached, direct)
+    np.testing.assert_array_equal(again, direct)
+
+
+def test_hit_on_read_only_cache(tmp_path, monkeypatch):
+    cache = FlowCache(tmp_path)
+    cache.store("flow", 1, {}, dict(u_field=np.ones(3)))
+
+    def read_only(*args, **kwargs):
+        raise PermissionError("read-only file system")
+
+    monkeypatch.setattr(os, "utime", read_only)
+    np.testing.assert_array_equal(cache.load("flow", 1, {})["u_field"], 1)
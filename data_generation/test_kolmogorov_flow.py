@@ -0,0 +1,149 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from data_generation import FlowCache, kolmogorov_flow
+from data_generation.kolmogorov_flow import generate_cfd_kolmogorov_flow
+
+
+class _FakeSimul:
+    """
+    Stands in for the fluidsim solver. The spectral state is (solver steps
+    taken, seed); ux reports the steps and uy the seed at every grid point.
+    """
+
+    def __init__(self, nx, ny, dt, seed, log):
+        self.shape = (nx, ny)
+        self.log = log
+        self.state = SimpleNamespace(state_spect=np.array([0.0, seed]),
+                                     statephys_from_statespect=lambda: None,
+                                     get_var=self.get_var)
+        self.time_stepping = SimpleNamespace(t=0.0, it=0, one_time_step=self.one_time_step)
+        self.dt = dt
+
+    def one_time_step(self):
+        self.state.state_spect[0] += 1
+        self.time_stepping.t += self.dt
+        self.time_stepping.it += 1
+        self.log["steps"] += 1
+
+    def get_var(self, name):
+        return np.full(self.shape, self.state.state_spect[0 if name == "ux" else 1])
+
+
+@pytest.fixture
+def solver_log(monkeypatch):
+    log = dict(runs=0, steps=0)
+
+    def make_simul(n_timesteps, nx, ny, lx, ly, dt, nu, forcing_amp, kf, seed):
+        log["runs"] += 1
+        return _FakeSimul(nx, ny, dt, seed, log)
+
+    monkeypatch.setattr(kolmogorov_flow, "_make_simul", make_simul)
+    return log
+
+
+def _steps(u_field):
+    """Solver step of every snapshot, as recorded by the fake solver."""
+    return np.asarray(u_field[:, 0, 0]).astype(int).tolist()
+
+
+def test_resume_from_shorter_prefix(tmp_path, solver_log):
+    u, _ = generate_cfd_kolmogorov_flow(5, 4, 3, cache_dir=tmp_path)
+    assert _steps(u) == [0, 1, 2, 3, 4]
+    assert solver_log["steps"] == 4
+
+    u, v = generate_cfd_kolmogorov_flow(9, 4, 3, cache_dir=tmp_path)
+    assert u.shape == v.shape == (9, 4, 3)
+    assert _steps(u) == list(range(9))
+    # only the four missing snapshots were integrated
+    assert solver_log["steps"] == 8
+    # the longer entry supersedes the prefix it was extended from
+    assert len(FlowCache(tmp_path).keys("kolmogorov")) == 1
+
+
+def test_shorter_request_is_a_slice(tmp_path, solver_log):
+    generate_cfd_kolmogorov_flow(9, 4, 3, cache_dir=tmp_path)
+    u, v = generate_cfd_kolmogorov_flow(4, 4, 3, cache_dir=tmp_path)
+    assert solver_log["runs"] == 1
+    assert isinstance(u, np.memmap) and u.shape == v.shape == (4, 4, 3)
+    assert _steps(u) == [0, 1, 2, 3]
+
+
+def test_parameters_separate_cache_entries(tmp_path, solver_log):
+    generate_cfd_kolmogorov_flow(3, 4, 3, cache_dir=tmp_path)
+    generate_cfd_kolmogorov_flow(3, 4, 3, nu=2e-3, cache_dir=tmp_path)
+    generate_cfd_kolmogorov_flow(3, 4, 3, cache_dir=tmp_path)
+    assert solver_log["runs"] == 2
+    assert len(FlowCache(tmp_path).keys("kolmogorov")) == 2
+
+
+def test_without_cache(tmp_path, solver_log):
+    u, _ = generate_cfd_kolmogorov_flow(3, 4, 3, use_cache=False, cache_dir=tmp_path)
+    generate_cfd_kolmogorov_flow(3, 4, 3, use_cache=False, cache_dir=tmp_path)
+    assert not isinstance(u, np.memmap) and solver_log["runs"] == 2
+    assert not FlowCache(tmp_path).keys("kolmogorov")
+
+
+def test_spinup_and_decimation(tmp_path, solver_log):
+    u, _ = generate_cfd_kolmogorov_flow(4, 4, 3, save_every=3, spinup_steps=5,
+                                        cache_dir=tmp_path)
+    # snapshot k is taken after spinup_steps + k * save_every solver steps
+    assert _steps(u) == [5, 8, 11, 14]
+    assert solver_log["steps"] == 14
+
+    # resuming keeps the cadence, and a different cadence is a different run
+    u, _ = generate_cfd_kolmogorov_flow(6, 4, 3, save_every=3, spinup_steps=5,
+                                        cache_dir=tmp_path)
+    assert _steps(u) == [5, 8, 11, 14, 17, 20]
+    assert solver_log["steps"] == 20
+    u, _ = generate_cfd_kolmogorov_flow(4, 4, 3, save_every=2, cache_dir=tmp_path)
+    assert _steps(u) == [0, 2, 4, 6]
+
+
+@pytest.mark.parametrize("kwargs", [dict(save_every=0), dict(spinup_steps=-1)])
+def test_invalid_cadence(tmp_path, kwargs):
+    with pytest.raises(ValueError):
+        generate_cfd_kolmogorov_flow(4, 4, 3, cache_dir=tmp_path, **kwargs)
+
+
+def test_seed_is_part_of_the_key(tmp_path, solver_log):
+    _, v = generate_cfd_kolmogorov_flow(3, 4, 3, seed=1, cache_dir=tmp_path)
+    _, v2 = generate_cfd_kolmogorov_flow(3, 4, 3, seed=2, cache_dir=tmp_path)
+    generate_cfd_kolmogorov_flow(3, 4, 3, seed=1, cache_dir=tmp_path)
+    assert solver_log["runs"] == 2
+    assert (np.asarray(v) == 1).all() and (np.asarray(v2) == 2).all()
+
+
+class _Params(SimpleNamespace):
+    def __getattr__(self, name):
+        value = _Params()
+        setattr(self, name, value)
+        return value
+
+
+class _NoiseSimul:
+    """Draws its initial condition from numpy's global generator, like fluidsim."""
+
+    @staticmethod
+    def create_default_params():
+        return _Params()
+
+    def __init__(self, params):
+        self.noise = np.random.standard_normal(5)
+
+
+def test_make_simul_seeds_the_noise(tmp_path, monkeypatch):
+    monkeypatch.setattr(kolmogorov_flow, "_simul_class", lambda: _NoiseSimul)
+    monkeypatch.setattr(kolmogorov_flow.tempfile, "mkdtemp", lambda: str(tmp_path))
+    args = (10, 8, 8, 1.0, 1.0, 1e-3, 1e-3, 0.1, 4)
+    np.random.seed(123)
+    state = np.random.get_state()
+    a = kolmogorov_flow._make_simul(*args, seed=7).noise
+    b = kolmogorov_flow._make_simul(*args, seed=7).noise
+    c = kolmogorov_flow._make_simul(*args, seed=8).noise
+    np.testing.assert_array_equal(a, b)
+    assert not np.array_equal(a, c)
+    # the caller's random state is left untouched
+    assert np.random.get_state()[1].tolist() == state[1].tolist()
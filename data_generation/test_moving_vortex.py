@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from data_generation import generate_moving_vortex, generate_multi_vortex
+from data_generation.moving_vortex import circular_orbit
+
+
+def _loop_vortices(centers, nx, ny, gammas, core_radii, lx=1, ly=1):
+    # the original formulation: one timestep and one full grid per vortex
+    Xgrid, Ygrid = np.meshgrid(np.linspace(0, lx, nx), np.linspace(0, ly, ny), indexing='ij')
+    u_field = np.zeros((len(centers), nx, ny))
+    v_field = np.zeros((len(centers), nx, ny))
+    for t in range(len(centers)):
+        for (x0, y0), Gamma, r_c in zip(centers[t], gammas, core_radii):
+            dx = Xgrid - x0
+            dy = Ygrid - y0
+            r2 = dx**2 + dy**2
+            r2[r2 == 0] = 1e-10
+            factor = 1 - np.exp(-r2 / (r_c**2))
+            u_field[t] -= (Gamma / (2 * np.pi)) * (dy / r2) * factor
+            v_field[t] += (Gamma / (2 * np.pi)) * (dx / r2) * factor
+    return u_field, v_field
+
+
+def test_single_vortex_is_unchanged():
+    # the pre-refactor generate_moving_vortex, bit for bit
+    u_ref, v_ref = _loop_vortices(circular_orbit(12, period=5), 21, 11, [1.0], [0.1])
+    u, v = generate_moving_vortex(12, 21, 11, period=5)
+    np.testing.assert_array_equal(u, u_ref)
+    np.testing.assert_array_equal(v, v_ref)
+
+
+def test_multi_vortex_matches_loop():
+    rng = np.random.default_rng(0)
+    centers = rng.uniform(0, 1, (7, 4, 2))
+    gammas, core_radii = [1.0, -0.5, 2.0, 0.3], [0.1, 0.2, 0.05, 0.3]
+    u_ref, v_ref = _loop_vortices(centers, 13, 9, gammas, core_radii)
+    u, v = generate_multi_vortex(centers, 13, 9, gammas=gammas, core_radii=core_radii)
+    np.testing.assert_allclose(u, u_ref, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(v, v_ref, rtol=1e-12, atol=1e-12)
+
+
+def test_vortex_on_a_grid_point():
+    # r = 0 at the center is clamped instead of dividing by zero
+    u, v = generate_multi_vortex(np.array([[[0.5, 0.5]]]), 11, 11)
+    assert np.isfinite(u).all() and np.isfinite(v).all()
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_out(tmp_path, use_cache):
+    centers = circular_orbit(5, period=5)
+    ref = generate_multi_vortex(centers, 8, 6, dtype=np.float32)
+    out = (np.empty((5, 8, 6), np.float32), np.empty((5, 8, 6), np.float32))
+    u, v = generate_multi_vortex(centers, 8, 6, out=out, use_cache=use_cache, cache_dir=tmp_path)
+    assert u is out[0] and v is out[1]
+    np.testing.assert_array_equal(u, ref[0])
+    np.testing.assert_array_equal(v, ref[1])
+    with pytest.raises(ValueError):
+        generate_multi_vortex(centers, 8, 6, out=(out[0], out[1][:, :-1]),
+                              use_cache=use_cache, cache_dir=tmp_path)
+    with pytest.raises(ValueError):
+        generate_multi_vortex(centers, 8, 6, out=(out[0], out[1].astype(np.float64)),
+                              use_cache=use_cache, cache_dir=tmp_path)
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from data_generation import SnapshotStore
+
+
+def _fields(n_timesteps=23, nx=9, ny=7, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal((n_timesteps, nx, ny)).astype(np.float32),
+            rng.standard_normal((n_timesteps, nx, ny)).astype(np.float32))
+
+
+@pytest.mark.parametrize("level", [1, None])
+def test_round_trip(tmp_path, level):
+    u, v = _fields()
+    with SnapshotStore(tmp_path, u.shape[1:], chunks=(5, 4, 3), level=level) as store:
+        store.append(u=u[:7], v=v[:7])
+        store.append(u[7:], v[7:])
+    store = SnapshotStore.open(tmp_path)
+    assert store["u"].shape == u.shape
+    np.testing.assert_array_equal(store["u"][:], u)
+    np.testing.assert_array_equal(store["v"][:], v)
+
+
+def test_windows(tmp_path):
+    u, v = _fields()
+    with SnapshotStore(tmp_path, u.shape[1:], chunks=(5, 4, 3)) as store:
+        store.append(u, v)
+    field = SnapshotStore.open(tmp_path)["u"]
+    for key in [(slice(3, 12), slice(2, 7), slice(1, 6)),
+                (4, slice(None), 5),
+                (slice(None, None, -3), slice(1, 8, 2)),
+                (-1,)]:
+        np.testing.assert_array_equal(field[key], u[key])
+
+
+def test_resume_append(tmp_path):
+    u, v = _fields()
+    with SnapshotStore(tmp_path, u.shape[1:], chunks=(5, 4, 3)) as store:
+        store.append(u[:8], v[:8])
+    with SnapshotStore.open(tmp_path) as store:
+        assert len(store["u"]) == 8
+        store.append(u[8:], v[8:])
+    np.testing.assert_array_equal(SnapshotStore.open(tmp_path)["v"][:], v)
+
+
+def test_missing_chunks_read_as_nan(tmp_path):
+    u, v = _fields()
+    with SnapshotStore(tmp_path, u.shape[1:], chunks=(5, 4, 3)) as store:
+        store.append(u, v)
+    store = SnapshotStore.open(tmp_path)
+    store.chunk_path("u", (1, 0, 0)).unlink()
+    window = store["u"][:]
+    assert np.isnan(window[5:10, :4, :3]).all()
+    window[5:10, :4, :3] = u[5:10, :4, :3]
+    np.testing.assert_array_equal(window, u)
+
+
+def test_side_arrays_and_attrs(tmp_path):
+    u, v = _fields()
+    with SnapshotStore(tmp_path, u.shape[1:], attrs=dict(dt=0.5)) as store:
+        store.append(u, v)
+        store.save_array("t", np.arange(len(u)) * 0.5)
+    store = SnapshotStore.open(tmp_path)
+    assert store.attrs == dict(dt=0.5)
+    np.testing.assert_array_equal(store.load_array("t"), np.arange(len(u)) * 0.5)
+
+
+def test_rejects_wrong_shapes(tmp_path):
+    u, v = _fields()
+    store = SnapshotStore(tmp_path, u.shape[1:])
+    with pytest.raises(ValueError):
+        store.append(u)
+    with pytest.raises(ValueError):
+        store.append(u, v[:, :-1])
+    with pytest.raises(FileNotFoundError):
+        SnapshotStore.open(tmp_path / "missing")
@@ -1,10 +1,15 @@
-from .complex_num import to_complex_cartesian, to_complex_polar
+from .complex_num import to_complex_cartesian, to_complex_polar, to_polar
 from .relfection import reflect_data_y
 from .rotation import rotate_data_90
+from .symmetry import AugmentedFlow, SymmetryTransform, dihedral_group
 
 __all__ = [
     "reflect_data_y",
     "rotate_data_90",
     "to_complex_cartesian",
-    "to_complex_polar"
+    "to_complex_polar",
+    "to_polar",
+    "SymmetryTransform",
+    "AugmentedFlow",
+    "dihedral_group"
 ]
\ No newline at end of file
@@ -0,0 +1,20 @@
+import numpy as np
+
+
+def finalize(view, copy=False, out=None):
+    """
+    Common return contract of the index transforms.
+
+    By default the strided view itself is returned, so no data is copied and
+    chained transforms stay views of the original array. With `copy=True`
+    a C-contiguous copy is returned instead, and with `out` the view is
+    written into the given buffer (shape must match), which is returned.
+    """
+    if out is not None:
+        if out.shape != view.shape:
+            raise ValueError(f"out has shape {out.shape}, expected {view.shape}")
+        np.copyto(out, view)
+        return out
+    if copy:
+        return np.array(view, order="C")
+    return view
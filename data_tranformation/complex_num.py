@@ -1,9 +1,102 @@
 import numpy as np
 
-def to_complex_cartesian(u, v):
-    return u + 1j * v
+# Inputs whose output exceeds this many bytes are converted in time chunks,
+# so memory-mapped inputs are paged through a bounded working set.
+MEMORY_BUDGET = 256 * 2**20
 
-def to_complex_polar(u, v):
-    r = np.sqrt(u**2 + v**2)
-    theta = np.arctan2(v, u)
-    return r * np.exp(1j * theta)
\ No newline at end of file
+
+def _chunks(n_timesteps, bytes_per_step, memory_budget):
+    step = max(1, memory_budget // max(1, bytes_per_step))
+    for start in range(0, n_timesteps, step):
+        yield slice(start, min(start + step, n_timesteps))
+
+
+def _check_out(out, shape, n):
+    if len(out) != n:
+        raise ValueError(f"out must hold {n} arrays")
+    for arr in out:
+        if arr.shape != shape:
+            raise ValueError(f"out has shape {arr.shape}, expected {shape}")
+
+
+def to_complex_cartesian(u, v, dtype=None, out=None, memory_budget=MEMORY_BUDGET):
+    """
+    Pack a velocity field into one complex field u + 1j·v.
+
+    The real and imaginary parts are written straight into the complex
+    output, without any full-size temporaries.
+
+    Parameters
+    ----------
+    u, v : np.ndarray of shape (n_timesteps, nx, ny), or broadcastable to it
+    dtype : np.complex64 or np.complex128, optional
+        Output precision, by default the complex type matching u and v.
+    out : np.ndarray, optional
+        Preallocated complex buffer that receives the result.
+    memory_budget : int
+        Bytes of output converted per chunk along the time axis.
+    """
+    # python scalars do not promote, as in u + 1j*v
+    u, v = (x if isinstance(x, (int, float)) else np.asarray(x) for x in (u, v))
+    dtype = dtype or np.result_type(u, v, np.complex64)
+    # broadcast like u + 1j*v, e.g. a constant v; the views cost no memory
+    u, v = np.broadcast_arrays(u, v)
+    if out is None:
+        out = np.empty(u.shape, dtype=dtype)
+    else:
+        _check_out((out,), u.shape, 1)
+    if u.ndim == 0:
+        out.real, out.imag = u, v
+        return out
+
+    bytes_per_step = out[0].nbytes if out.ndim > 1 else out.itemsize
+    for s in _chunks(len(u), bytes_per_step, memory_budget):
+        out.real[s] = u[s]
+        out.imag[s] = v[s]
+    return out
+
+
+def to_complex_polar(u, v, dtype=None, out=None, memory_budget=MEMORY_BUDGET):
+    """
+    Complex field r·exp(1j·θ) with r = |(u, v)| and θ = arctan2(v, u).
+
+    This is identically u + 1j·v, so it is computed by the same fused pass
+    as `to_complex_cartesian` (and takes the same arguments). Use `to_polar`
+    for magnitude and phase as separate real planes.
+    """
+    return to_complex_cartesian(u, v, dtype=dtype, out=out, memory_budget=memory_budget)
+
+
+def to_polar(u, v, dtype=np.float32, out=None, memory_budget=MEMORY_BUDGET):
+    """
+    Real polar representation of a velocity field.
+
+    Parameters
+    ----------
+    u, v : np.ndarray of shape (n_timesteps, nx, ny), or broadcastable to it
+    dtype : floating point type of the two output planes.
+    out : optional (magnitude, phase) pair of preallocated buffers.
+    memory_budget : int
+        Bytes of output converted per chunk along the time axis.
+
+    Returns
+    -------
+    magnitude, phase : np.ndarray
+        sqrt(u² + v²) and arctan2(v, u), each of the input shape.
+    """
+    u, v = np.broadcast_arrays(np.asarray(u), np.asarray(v))
+    if out is None:
+        out = (np.empty(u.shape, dtype=dtype), np.empty(u.shape, dtype=dtype))
+    else:
+        _check_out(out, u.shape, 2)
+    magnitude, phase = out
+    if u.ndim == 0:
+        magnitude[...] = np.hypot(u, v)
+        phase[...] = np.arctan2(v, u)
+        return magnitude, phase
+
+    bytes_per_step = 2 * (magnitude[0].nbytes if magnitude.ndim > 1 else magnitude.itemsize)
+    for s in _chunks(len(u), bytes_per_step, memory_budget):
+        np.hypot(u[s], v[s], out=magnitude[s])
+        np.arctan2(v[s], u[s], out=phase[s])
+    return magnitude, phase
@@ -1,10 +1,21 @@
-def reflect_data_y(data):
+from ._output import finalize
+
+
+def reflect_data_y(data, copy=False, out=None):
     """
     Reflect each snapshot about the horizontal midline in y (about y = L_y/2).
     
     Parameters
     ----------
     data : np.ndarray of shape (n_timesteps, nx, ny)
+    copy : bool, optional
+        Return a C-contiguous copy instead of a view.
+    out : np.ndarray of shape (n_timesteps, nx, ny), optional
+        Buffer that receives the reflected data.
+
+    Returns
+    -------
+    A view of `data` with the y axis reversed (no data is copied) unless
+    `copy` or `out` is given.
     """
-    data_reflected = data[..., ::-1]
-    return data_reflected
\ No newline at end of file
+    return finalize(data[..., ::-1], copy=copy, out=out)
@@ -1,21 +1,24 @@
 import numpy as np
 
-def rotate_data_90(data):
+from ._output import finalize
+
+
+def rotate_data_90(data, copy=False, out=None):
     """
     Rotate each snapshot by 90 degrees counterclockwise.
     
     Parameters
     ----------
     data : np.ndarray of shape (n_timesteps, nx, ny)
+    copy : bool, optional
+        Return a C-contiguous copy instead of a view.
+    out : np.ndarray of shape (n_timesteps, ny, nx), optional
+        Buffer that receives the rotated data.
+
+    Returns
+    -------
+    An array of shape (n_timesteps, ny, nx). By default this is a strided
+    view of `data` (no data is copied) unless `copy` or `out` is given.
     """
-    # We'll collect each rotated snapshot, then stack them back into an array.
-    data_rotated_list = []
-    for t in range(data.shape[0]):
-        # Rotate data[t] (shape (nx, ny)) by 90 deg counterclockwise
-        # np.rot90() outputs shape (ny, nx)
-        slice_rot = np.rot90(data[t])
-        data_rotated_list.append(slice_rot)
-    
-    # Stack them along the time dimension again
-    data_rotated = np.stack(data_rotated_list, axis=0)
-    return data_rotated
+    # np.rot90 over the spatial axes only swaps and flips strides.
+    return finalize(np.rot90(data, axes=(1, 2)), copy=copy, out=out)
@@ -0,0 +1,125 @@
+import numpy as np
+
+from ._output import finalize
+
+# Action of the generators on a velocity vector (u, v):
+# a quarter turn counterclockwise maps (u, v) -> (-v, u),
+# the reflection y -> -y maps (u, v) -> (u, -v).
+_ROTATION = np.array([[0, -1], [1, 0]])
+_REFLECTION = np.array([[1, 0], [0, -1]])
+
+
+class SymmetryTransform:
+    """
+    Element of the dihedral group D4 acting on (n_timesteps, nx, ny) snapshots.
+
+    The element is stored symbolically as "reflect about y = L_y/2 (if
+    `reflect`), then rotate `rotations` quarter turns counterclockwise".
+    Chaining transforms only updates these two numbers, so an arbitrary
+    chain collapses to a single index permutation of the grid and a single
+    swap/sign flip of the velocity components.
+
+    Example
+    -------
+    >>> t = SymmetryTransform().rotate().reflect_y()   # rotate, then reflect
+    >>> flow = t.apply(u_field, v_field)               # lazy, nothing copied
+    >>> u_win, v_win = flow[100:200, :64, :64]         # materialize a window
+    """
+
+    __slots__ = ("rotations", "reflect")
+
+    def __init__(self, rotations=0, reflect=False):
+        self.rotations = rotations % 4
+        self.reflect = bool(reflect)
+
+    def __matmul__(self, other):
+        """`self @ other` applies `other` first, then `self`."""
+        # S R^k = R^-k S, so R^a S^r R^b S^s = R^(a ± b) S^(r xor s)
+        turns = -other.rotations if self.reflect else other.rotations
+        return SymmetryTransform(self.rotations + turns, self.reflect != other.reflect)
+
+    def then(self, other):
+        """Apply this transform, then `other`."""
+        return other @ self
+
+    def rotate(self, k=1):
+        """Follow this transform by `k` quarter turns counterclockwise."""
+        return self.then(SymmetryTransform(k))
+
+    def reflect_y(self):
+        """Follow this transform by a reflection about y = L_y/2."""
+        return self.then(SymmetryTransform(0, True))
+
+    def inverse(self):
+        if self.reflect:
+            return self
+        return SymmetryTransform(-self.rotations)
+
+    @property
+    def matrix(self):
+        """2x2 integer matrix mapping (u, v) to the transformed components."""
+        m = np.linalg.matrix_power(_ROTATION, self.rotations)
+        return m @ _REFLECTION if self.reflect else m
+
+    def apply_scalar(self, data, copy=False, out=None):
+        """
+        Move the values of a scalar field to their transformed positions.
+        Returns a strided view of `data` unless `copy` or `out` is given.
+        """
+        view = data[..., ::-1] if self.reflect else data
+        return finalize(np.rot90(view, self.rotations, axes=(1, 2)), copy=copy, out=out)
+
+    def apply(self, u_field, v_field):
+        """Lazily transform a velocity field; see `AugmentedFlow`."""
+        return AugmentedFlow(u_field, v_field, self)
+
+    def __eq__(self, other):
+        return (isinstance(other, SymmetryTransform)
+                and (self.rotations, self.reflect) == (other.rotations, other.reflect))
+
+    def __hash__(self):
+        return hash((self.rotations, self.reflect))
+
+    def __repr__(self):
+        return f"SymmetryTransform(rotations={self.rotations}, reflect={self.reflect})"
+
+
+def dihedral_group():
+    """The 8 rotations and reflections of the square, identity first."""
+    return [SymmetryTransform(k, r) for r in (False, True) for k in range(4)]
+
+
+class AugmentedFlow:
+    """
+    A velocity field (u, v) seen through a `SymmetryTransform`.
+
+    Construction only builds strided views; data is materialized when a
+    window is requested with `flow[t0:t1, x0:x1, y0:y1]`, which returns the
+    transformed (u, v) pair of that window as new arrays. Window indices
+    refer to the transformed grid.
+    """
+
+    def __init__(self, u_field, v_field, transform):
+        self.transform = transform
+        views = (transform.apply_scalar(u_field), transform.apply_scalar(v_field))
+
+        # Every row of the matrix has exactly one ±1 entry: each output
+        # component is one (possibly negated) input component.
+        matrix = transform.matrix
+        self._sources = [views[int(np.flatnonzero(row)[0])] for row in matrix]
+        self._signs = [int(row.sum()) for row in matrix]
+
+    @property
+    def shape(self):
+        return self._sources[0].shape
+
+    def __getitem__(self, key):
+        fields = []
+        for source, sign in zip(self._sources, self._signs):
+            window = source[key]
+            fields.append(np.negative(window) if sign < 0 else np.array(window))
+        return tuple(fields)
+
+    def materialize(self):
+        """Transformed (u, v) over the whole domain and time range."""
+        return self[...]
@@ -1,6 +1,6 @@
+# run from the repository root: python -m data_tranformation.test
 import numpy as np
-from relfection import reflect_data_y
-from rotation import rotate_data_90
+from data_tranformation import reflect_data_y, rotate_data_90
 import matplotlib.pyplot as plt
 
 
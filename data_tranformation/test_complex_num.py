@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from data_tranformation import to_complex_cartesian, to_complex_polar, to_polar
+
+
+def _fields(seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal((6, 5, 4)).astype(np.float32),
+            rng.standard_normal((6, 5, 4)).astype(np.float32))
+
+
+def test_cartesian_and_polar_match_numpy():
+    u, v = _fields()
+    z = to_complex_cartesian(u, v)
+    assert z.dtype == np.complex64
+    np.testing.assert_array_equal(z, u + 1j * v)
+    np.testing.assert_allclose(to_complex_polar(u, v), z)
+    magnitude, phase = to_polar(u, v)
+    np.testing.assert_allclose(magnitude, np.hypot(u, v), rtol=1e-6)
+    np.testing.assert_allclose(phase, np.arctan2(v, u), rtol=1e-6)
+
+
+def test_small_memory_budget_and_out():
+    u, v = _fields()
+    out = np.empty(u.shape, dtype=np.complex128)
+    z = to_complex_cartesian(u, v, out=out, memory_budget=1)
+    assert z is out
+    np.testing.assert_array_equal(z, u + 1j * v)
+
+
+def test_broadcasting_inputs():
+    u, _ = _fields()
+    z = to_complex_cartesian(u, 1.0)
+    assert z.dtype == np.complex64
+    np.testing.assert_array_equal(z, u + 1j)
+    np.testing.assert_array_equal(to_complex_cartesian(u[:, :1], u), u[:, :1] + 1j * u)
+    magnitude, _ = to_polar(u, np.zeros(u.shape[-1]))
+    np.testing.assert_allclose(magnitude, np.abs(u))
+
+
+def test_shape_mismatch():
+    u, v = _fields()
+    with pytest.raises(ValueError):
+        to_complex_cartesian(u, v[:, :2])
@@ -0,0 +1,53 @@
+import itertools
+
+import numpy as np
+
+from data_tranformation import (SymmetryTransform, dihedral_group, reflect_data_y,
+                                rotate_data_90)
+
+
+def _fields(seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((3, 6, 6)), rng.standard_normal((3, 6, 6))
+
+
+def test_group_structure():
+    group = dihedral_group()
+    assert len(set(group)) == 8
+    identity = SymmetryTransform()
+    for a, b in itertools.product(group, repeat=2):
+        assert a @ b in group
+    for t in group:
+        assert t @ t.inverse() == identity
+        assert t.inverse() @ t == identity
+
+
+def test_generators_match_index_transforms():
+    u, v = _fields()
+    u_rot, v_rot = SymmetryTransform().rotate().apply(u, v).materialize()
+    # a quarter turn maps (u, v) -> (-v, u)
+    np.testing.assert_array_equal(u_rot, -rotate_data_90(v))
+    np.testing.assert_array_equal(v_rot, rotate_data_90(u))
+    u_ref, v_ref = SymmetryTransform().reflect_y().apply(u, v).materialize()
+    np.testing.assert_array_equal(u_ref, reflect_data_y(u))
+    np.testing.assert_array_equal(v_ref, -reflect_data_y(v))
+
+
+def test_chain_equals_sequential_application():
+    u, v = _fields()
+    for a, b in itertools.product(dihedral_group(), repeat=2):
+        step = b.apply(*a.apply(u, v).materialize()).materialize()
+        chained = a.then(b).apply(u, v).materialize()
+        np.testing.assert_array_equal(step[0], chained[0])
+        np.testing.assert_array_equal(step[1], chained[1])
+
+
+def test_window_and_views():
+    u, v = _fields()
+    t = SymmetryTransform(1, True)
+    flow = t.apply(u, v)
+    full = flow.materialize()
+    window = flow[1:3, :4, 2:]
+    np.testing.assert_array_equal(window[0], full[0][1:3, :4, 2:])
+    np.testing.assert_array_equal(window[1], full[1][1:3, :4, 2:])
+    assert np.shares_memory(t.apply_scalar(u), u)
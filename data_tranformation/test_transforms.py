@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from data_tranformation import reflect_data_y, rotate_data_90
+
+
+def _data():
+    return np.arange(2 * 4 * 3, dtype=float).reshape(2, 4, 3)
+
+
+@pytest.mark.parametrize("transform, expected", [
+    (reflect_data_y, lambda d: d[..., ::-1]),
+    (rotate_data_90, lambda d: np.rot90(d, axes=(1, 2))),
+])
+def test_view_copy_and_out(transform, expected):
+    data = _data()
+    reference = np.array(expected(data))
+
+    view = transform(data)
+    assert np.shares_memory(view, data)
+    np.testing.assert_array_equal(view, reference)
+
+    copy = transform(data, copy=True)
+    assert not np.shares_memory(copy, data)
+    assert copy.flags.c_contiguous
+    np.testing.assert_array_equal(copy, reference)
+
+    out = np.empty_like(reference)
+    assert transform(data, out=out) is out
+    np.testing.assert_array_equal(out, reference)
+
+    # the view follows later writes to the input, the copies do not
+    data += 1
+    np.testing.assert_array_equal(view, reference + 1)
+    np.testing.assert_array_equal(copy, reference)
+    np.testing.assert_array_equal(out, reference)
+
+
+def test_out_shape_is_checked():
+    with pytest.raises(ValueError):
+        rotate_data_90(_data(), out=np.empty((2, 4, 3)))
+
+
+def test_chained_views_stay_views():
+    data = _data()
+    chained = reflect_data_y(rotate_data_90(data))
+    assert np.shares_memory(chained, data)
+    np.testing.assert_array_equal(chained, np.rot90(data, axes=(1, 2))[..., ::-1])
@@ -0,0 +1,8 @@
+from .incremental_svd import IncrementalPOD, svd_append
+from .randomized_svd import randomized_pod
+
+__all__ = [
+    "IncrementalPOD",
+    "randomized_pod",
+    "svd_append"
+]
\ No newline at end of file
@@ -0,0 +1,36 @@
+import numpy as np
+
+# Size of the block of snapshot rows converted to the working precision at
+# a time, so float64 or memory-mapped inputs are never copied as a whole.
+CHUNK_BYTES = 64 * 2**20
+
+
+def row_chunks(X, itemsize=8, chunk_bytes=CHUNK_BYTES):
+    step = max(1, chunk_bytes // (X.shape[1] * itemsize))
+    for start in range(0, X.shape[0], step):
+        yield slice(start, min(start + step, X.shape[0]))
+
+
+def times(X, M, dtype):
+    """X @ M, streaming the rows of X."""
+    out = np.empty((X.shape[0], M.shape[1]), dtype=dtype)
+    for rows in row_chunks(X):
+        np.matmul(np.asarray(X[rows], dtype=dtype), M, out=out[rows])
+    return out
+
+
+def transpose_times(X, Q, dtype):
+    """X.T @ Q, streaming the rows of X."""
+    out = np.zeros((X.shape[1], Q.shape[1]), dtype=dtype)
+    for rows in row_chunks(X):
+        out += np.asarray(X[rows], dtype=dtype).T @ Q[rows]
+    return out
+
+
+def squared_norm(X):
+    """||X||_F², accumulated in float64."""
+    total = 0.0
+    for rows in row_chunks(X):
+        block = np.asarray(X[rows], dtype=np.float64)
+        total += float(np.einsum("ij,ij->", block, block))
+    return total
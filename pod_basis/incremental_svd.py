@@ -0,0 +1,120 @@
+import numpy as np
+
+from state_concatenation import StateLayout
+
+
+def svd_append(U, S, C):
+    """
+    Brand update of a thin SVD when columns are appended.
+
+    Given A ≈ U diag(S) Vᵀ, returns (U', S', W) such that
+    [A, C] ≈ U' diag(S') Wᵀ blockdiag(V, I)ᵀ, i.e. the new right singular
+    vectors are blockdiag(V, I) @ W. Nothing is truncated.
+    """
+    M = U.T @ C
+    R = C - U @ M
+    # second Gram-Schmidt pass keeps the basis orthonormal in float32
+    M2 = U.T @ R
+    R -= U @ M2
+    M += M2
+    P, R_r = np.linalg.qr(R)
+    # When C (nearly) lies in span(U), the residual is rounding noise and
+    # its QR factor drifts out of the orthogonal complement; project again.
+    P -= U @ (U.T @ P)
+    P, R_p = np.linalg.qr(P)
+    R_r = R_p @ R_r
+
+    k, b = len(S), C.shape[1]
+    K = np.zeros((k + b, k + b), dtype=U.dtype)
+    K[:k, :k] = np.diag(S)
+    K[:k, k:] = M
+    K[k:, k:] = R_r
+    U_k, S_k, V_kt = np.linalg.svd(K)
+    return np.hstack((U, P)) @ U_k, S_k, V_kt.T
+
+
+class IncrementalPOD:
+    """
+    Streaming POD of a snapshot matrix that arrives in blocks of rows
+    (Brand's incremental SVD).
+
+    Only the spatial basis (n_features x (rank + oversampling)) and its
+    singular values are kept, so memory does not grow with the number of
+    snapshots. Each block costs one projection onto the basis, a QR of the
+    residual and an SVD of a small (k + b) x (k + b) core matrix.
+
+    Example
+    -------
+    >>> pod = IncrementalPOD(rank=20)
+    >>> pod.fit(iter_double_gyre_chunks(10_000, 512, 256, chunk_size=256))
+    >>> pod.modes.shape, pod.rel_error
+
+    `layout` places the fields of `(t_slice, *fields)` chunks in a snapshot
+    row, by default side by side as in `combine_fields`; with a mask only
+    its valid points enter the basis.
+    """
+
+    def __init__(self, rank, oversampling=10, dtype=np.float32, layout=None):
+        self.rank = rank
+        self.n_keep = rank + oversampling
+        self.dtype = dtype
+        self.layout = layout
+        self.basis = None
+        self.singular_values = np.empty(0, dtype=dtype)
+        self.n_samples = 0
+        self._total_energy = 0.0
+        self._discarded_energy = 0.0
+
+    def partial_fit(self, chunk):
+        """
+        Add a block of snapshots of shape (n_rows, n_features), or a
+        `(t_slice, *fields)` chunk of (n_rows, nx, ny) fields from an
+        `iter_*_chunks` generator, which is assembled through `layout`.
+        """
+        if isinstance(chunk, tuple):
+            _, *fields = chunk
+            if self.layout is None:
+                self.layout = StateLayout([(f"field{k}", field.shape[1:])
+                                           for k, field in enumerate(fields)])
+            chunk = self.layout.compress(self.layout.assemble(fields, dtype=self.dtype))
+        C = np.asarray(chunk, dtype=self.dtype).T           # (n_features, b)
+        self._total_energy += float(np.sum(C.astype(np.float64) ** 2))
+        self.n_samples += C.shape[1]
+
+        if self.basis is None:
+            U, s, _ = np.linalg.svd(C, full_matrices=False)
+            self._truncate(U, s)
+            return self
+
+        U, s, _ = svd_append(self.basis, self.singular_values, C)
+        self._truncate(U, s)
+        return self
+
+    def _truncate(self, U, s):
+        keep = min(self.n_keep, len(s))
+        self._discarded_energy += float(np.sum(s[keep:].astype(np.float64) ** 2))
+        self.basis = np.ascontiguousarray(U[:, :keep], dtype=self.dtype)
+        self.singular_values = s[:keep].astype(self.dtype)
+
+    def fit(self, chunks):
+        """Consume an iterable of snapshot blocks."""
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        return self
+
+    @property
+    def modes(self):
+        """Spatial POD modes, shape (n_features, rank)."""
+        return self.basis[:, :self.rank]
+
+    @property
+    def rel_error(self):
+        """
+        Estimated ||X - X modes modesᵀ||_F / ||X||_F: the energy discarded by
+        every truncation so far plus the energy beyond `rank` in the kept
+        spectrum, relative to the energy of all snapshots seen.
+        """
+        if self._total_energy == 0:
+            return 0.0
+        tail = float(np.sum(self.singular_values[self.rank:].astype(np.float64) ** 2))
+        return np.sqrt((self._discarded_energy + tail) / self._total_energy)
@@ -0,0 +1,56 @@
+import numpy as np
+
+from ._streaming import squared_norm, times, transpose_times
+
+
+def randomized_pod(X, rank, oversampling=10, n_power_iter=2, dtype=np.float32, seed=None):
+    """
+    POD modes of a snapshot matrix by randomized SVD (Halko, Martinsson & Tropp).
+
+    Parameters
+    ----------
+    X : np.ndarray (or memory map) of shape (n_timesteps, n_features)
+        Snapshot matrix, one flattened state per row, e.g. the output of
+        `StateLayout.assemble` or a flattened `combine_fields` result.
+    rank : int
+        Number of modes to return.
+    oversampling : int
+        Extra random directions sampled beyond `rank`.
+    n_power_iter : int
+        Subspace iterations; more iterations sharpen slowly decaying spectra.
+    dtype : working precision, float32 by default.
+    seed : seed of the random test matrix.
+
+    X is only touched through row blocks, so memory-mapped or float64 inputs
+    are streamed rather than converted as a whole.
+
+    Returns
+    -------
+    modes : np.ndarray of shape (n_features, rank)
+        Orthonormal spatial modes (right singular vectors of X).
+    singular_values : np.ndarray of shape (rank,)
+    rel_error : float
+        ||X - X modes modesᵀ||_F / ||X||_F of the rank-`rank` approximation.
+    """
+    n_timesteps, n_features = X.shape
+    n_samples = min(rank + oversampling, n_timesteps, n_features)
+    if rank > n_samples:
+        raise ValueError(f"rank {rank} exceeds the size of X {X.shape}")
+
+    rng = np.random.default_rng(seed)
+    omega = rng.standard_normal((n_features, n_samples)).astype(dtype)
+
+    # range finder with re-orthonormalized power iterations
+    Q, _ = np.linalg.qr(times(X, omega, dtype))
+    for _ in range(n_power_iter):
+        Z, _ = np.linalg.qr(transpose_times(X, Q, dtype))
+        Q, _ = np.linalg.qr(times(X, Z, dtype))
+
+    # B = Qᵀ X, whose right singular vectors approximate those of X
+    B = transpose_times(X, Q, dtype).T
+    _, s, Vt = np.linalg.svd(B, full_matrices=False)
+
+    total = squared_norm(X)
+    captured = float(np.sum(s[:rank].astype(np.float64) ** 2))
+    rel_error = np.sqrt(max(total - captured, 0.0) / total) if total > 0 else 0.0
+    return Vt[:rank].T, s[:rank], rel_error
@@ -0,0 +1,56 @@
+import numpy as np
+
+from pod_basis import IncrementalPOD
+from state_concatenation import StateLayout
+
+
+def _fields(n_timesteps=120, nx=12, ny=8, rank=5, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n_timesteps, rank)) @ rng.standard_normal((rank, 2 * nx * ny))
+    u = X[:, :nx * ny].reshape(-1, nx, ny)
+    v = X[:, nx * ny:].reshape(-1, nx, ny)
+    return u, v
+
+
+def _chunks(u, v, chunk_size=25):
+    for start in range(0, len(u), chunk_size):
+        t_slice = slice(start, start + chunk_size)
+        yield t_slice, u[t_slice], v[t_slice]
+
+
+def _assert_same_subspace(modes, X):
+    _, _, Vt = np.linalg.svd(X, full_matrices=False)
+    reference = Vt[:modes.shape[1]].T
+    np.testing.assert_allclose(np.abs(modes.T @ reference), np.eye(modes.shape[1]), atol=1e-4)
+
+
+def test_matches_batch_svd():
+    u, v = _fields()
+    X = StateLayout({"u": u.shape[1:], "v": v.shape[1:]}).assemble([u, v])
+    pod = IncrementalPOD(rank=5)
+    for start in range(0, len(X), 25):
+        pod.partial_fit(X[start:start + 25])
+    assert pod.n_samples == len(X)
+    _assert_same_subspace(pod.modes, X)
+    assert pod.rel_error < 1e-3
+
+
+def test_chunk_tuples_use_every_field():
+    u, v = _fields()
+    pod = IncrementalPOD(rank=5).fit(_chunks(u, v))
+    # both fields enter the snapshot rows, side by side as in combine_fields
+    assert pod.modes.shape == (2 * u[0].size, 5)
+    X = pod.layout.assemble([u, v])
+    _assert_same_subspace(pod.modes, X)
+
+
+def test_chunk_tuples_with_mask():
+    u, v = _fields()
+    mask = np.ones(u.shape[1:], dtype=bool)
+    mask[4:7, 3:5] = False
+    u, v = np.where(mask, u, np.nan), np.where(mask, v, np.nan)
+    layout = StateLayout({"u": u.shape[1:], "v": v.shape[1:]}, mask=mask)
+    pod = IncrementalPOD(rank=5, layout=layout).fit(_chunks(u, v))
+    assert pod.modes.shape == (layout.n_valid, 5)
+    assert np.isfinite(pod.modes).all()
+    _assert_same_subspace(pod.modes, layout.compress(layout.assemble([u, v])))
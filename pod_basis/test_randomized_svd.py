@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from pod_basis import randomized_pod
+
+
+def _snapshots(n_timesteps=200, n_features=300, decay=0.7, seed=0):
+    rng = np.random.default_rng(seed)
+    U, _ = np.linalg.qr(rng.standard_normal((n_timesteps, 40)))
+    V, _ = np.linalg.qr(rng.standard_normal((n_features, 40)))
+    return (U * decay ** np.arange(40)) @ V.T
+
+
+def test_matches_exact_svd():
+    X = _snapshots()
+    modes, s, rel_error = randomized_pod(X, 10, dtype=np.float64, seed=0)
+    _, s_ref, Vt = np.linalg.svd(X, full_matrices=False)
+    np.testing.assert_allclose(s, s_ref[:10], rtol=1e-6)
+    np.testing.assert_allclose(np.abs(modes.T @ Vt[:10].T), np.eye(10), atol=1e-5)
+    expected = np.sqrt(np.sum(s_ref[10:] ** 2) / np.sum(s_ref ** 2))
+    assert rel_error == pytest.approx(expected, rel=1e-4)
+
+
+def test_memory_map_input(tmp_path):
+    X = _snapshots().astype(np.float32)
+    np.save(tmp_path / "X.npy", X)
+    mapped = np.load(tmp_path / "X.npy", mmap_mode="r")
+    modes, s, _ = randomized_pod(mapped, 5, seed=1)
+    assert modes.shape == (X.shape[1], 5) and modes.dtype == np.float32
+    np.testing.assert_allclose(modes.T @ modes, np.eye(5), atol=1e-5)
+    np.testing.assert_allclose(s, np.linalg.svd(X, compute_uv=False)[:5], rtol=1e-3)
+
+
+def test_rank_too_large():
+    with pytest.raises(ValueError):
+        randomized_pod(np.ones((4, 3)), 5)
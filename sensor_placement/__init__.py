@@ -0,0 +1,16 @@
+from .greedy import greedy_sensors
+from .interval_selection import IntervalSensorSelector, select_sensors_per_interval
+from .parallel import select_sensors_parallel
+from .qr_pivoting import qr_sensors
+from .reconstruction import SparseReconstructor
+from .windowed_svd import WindowedSVD
+
+__all__ = [
+    "IntervalSensorSelector",
+    "select_sensors_per_interval",
+    "select_sensors_parallel",
+    "qr_sensors",
+    "greedy_sensors",
+    "SparseReconstructor",
+    "WindowedSVD"
+]
\ No newline at end of file
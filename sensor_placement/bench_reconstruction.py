@@ -0,0 +1,52 @@
+"""
+Throughput of SparseReconstructor in snapshots per second.
+
+    python -m sensor_placement.bench_reconstruction --nx 50 --ny 100 --rank 50
+
+The reconstruction is one float32 matrix product of about
+2 · rank · n_features flops per snapshot, so the rate scales with the
+cores given to BLAS (OPENBLAS_NUM_THREADS / OMP_NUM_THREADS) and
+inversely with the grid size.
+"""
+import argparse, os, time
+
+import numpy as np
+
+from state_concatenation import StateLayout
+
+from .reconstruction import SparseReconstructor
+
+
+def bench(nx, ny, rank, n_sensors, batch=4096, repeat=20, seed=0):
+    """Snapshots per second of `reconstruct` into a preallocated matrix."""
+    rng = np.random.default_rng(seed)
+    layout = StateLayout({"u": (nx, ny), "v": (nx, ny)})
+    modes, _ = np.linalg.qr(rng.standard_normal((layout.n_features, rank)))
+    sensors = rng.choice(layout.n_features, n_sensors, replace=False)
+    rec = SparseReconstructor(layout).fit(0, modes, sensors)
+
+    readings = rng.standard_normal((batch, n_sensors)).astype(np.float32)
+    out = layout.allocate(batch)
+    rec.reconstruct(readings, 0, out=out)       # first touch of `out`
+    start = time.perf_counter()
+    for _ in range(repeat):
+        rec.reconstruct(readings, 0, out=out)
+    return repeat * batch / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--nx", type=int, default=50)
+    parser.add_argument("--ny", type=int, default=100)
+    parser.add_argument("--rank", type=int, nargs="+", default=[10, 20, 50])
+    parser.add_argument("--sensors", type=int, default=None,
+                        help="number of sensors, by default the rank")
+    parser.add_argument("--batch", type=int, default=4096)
+    args = parser.parse_args()
+
+    threads = os.environ.get("OPENBLAS_NUM_THREADS") or os.environ.get("OMP_NUM_THREADS")
+    print(f"grid 2 x {args.nx} x {args.ny}, BLAS threads {threads or 'default'}, "
+          f"{os.cpu_count()} cpus")
+    for rank in args.rank:
+        rate = bench(args.nx, args.ny, rank, args.sensors or rank, args.batch)
+        print(f"rank {rank:3d}: {rate:12,.0f} snapshots/s")
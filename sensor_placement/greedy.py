@@ -0,0 +1,74 @@
+import heapq
+
+import numpy as np
+
+
+def greedy_sensors(modes, n_sensors, regularization=1e-6, block_size=64):
+    """
+    Sensor locations by greedy maximization of the D-optimal criterion
+
+        f(S) = log det(δ I + Σ_{i ∈ S} ψ_i ψ_iᵀ),
+
+    where ψ_i is row i of the POD basis. f is submodular, so the marginal
+    gain log(1 + ψ_iᵀ M⁻¹ ψ_i) of a candidate can only shrink as sensors are
+    added. Gains are therefore kept in a max-heap as upper bounds and only
+    the top of the heap is re-evaluated (lazy greedy); M⁻¹ is updated with a
+    rank-one Sherman-Morrison step per added sensor. Each added sensor costs
+    O(rank²) per re-evaluated candidate instead of a pass over all
+    candidates.
+
+    Unlike `qr_sensors`, more sensors than modes can be placed.
+
+    Parameters
+    ----------
+    modes : np.ndarray of shape (n_features, rank)
+        Spatial modes; every row is a candidate sensor location, e.g. the
+        flattened `combine_fields` grid.
+    n_sensors : int
+    regularization : float
+        δ relative to the mean squared row norm of `modes`; keeps M
+        invertible until `rank` sensors are placed.
+    block_size : int
+        Stale candidates taken from the top of the heap are re-evaluated in
+        blocks of up to this many rows, with one matrix product per block.
+
+    Returns
+    -------
+    np.ndarray of shape (n_sensors,)
+        Feature indices of the sensors, in selection order.
+    """
+    Psi = np.asarray(modes, dtype=np.float64)
+    n_features, rank = Psi.shape
+    if n_sensors > n_features:
+        raise ValueError(f"cannot place {n_sensors} sensors on {n_features} candidates")
+
+    row_norms = np.einsum("ij,ij->i", Psi, Psi)
+    delta = regularization * max(row_norms.mean(), np.finfo(np.float64).tiny)
+    M_inv = np.eye(rank) / delta
+
+    heap = list(zip((-np.log1p(row_norms / delta)).tolist(), range(n_features)))
+    heapq.heapify(heap)
+    # number of placed sensors when the heap value of a candidate was computed
+    evaluated_at = np.zeros(n_features, dtype=np.intp)
+
+    sensors = []
+    while len(sensors) < n_sensors:
+        neg_gain, i = heapq.heappop(heap)
+        if evaluated_at[i] == len(sensors):
+            # Up to date and no smaller than any upper bound left: take it.
+            psi = Psi[i]
+            g = M_inv @ psi
+            M_inv -= np.outer(g, g) / (1.0 + psi @ g)
+            sensors.append(i)
+            continue
+        # Re-evaluate the stale candidates at the top of the heap together.
+        stale = [i]
+        while (heap and len(stale) < block_size
+               and evaluated_at[heap[0][1]] != len(sensors)):
+            stale.append(heapq.heappop(heap)[1])
+        rows = Psi[stale]
+        gains = np.log1p(np.einsum("ij,ij->i", rows @ M_inv, rows))
+        evaluated_at[stale] = len(sensors)
+        for gain, j in zip(gains.tolist(), stale):
+            heapq.heappush(heap, (-gain, j))
+    return np.array(sensors, dtype=np.intp)
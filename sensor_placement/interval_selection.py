@@ -0,0 +1,111 @@
+import numpy as np
+
+from .greedy import greedy_sensors
+from .qr_pivoting import qr_sensors
+from .windowed_svd import WindowedSVD
+
+_METHODS = {"qr": qr_sensors, "greedy": greedy_sensors}
+
+
+class IntervalSensorSelector:
+    """
+    Optimal sensor locations for a list of time intervals of one snapshot tensor.
+
+    For every interval (s, e) the POD basis of snapshots s..e-1 is computed
+    and the sensors are chosen on it by QR column pivoting or by lazy greedy
+    D-optimal selection. Intervals are visited in order of their start; when
+    an interval shares at least rank + oversampling snapshots with the
+    previous window, the windowed SVD is updated with the snapshots that
+    enter and leave instead of being recomputed, so sliding windows reuse
+    most of the work. Every `refresh_every` updates the window is
+    recomputed exactly to bound the drift of the truncated updates.
+
+    Parameters
+    ----------
+    snapshots : np.ndarray of shape (n_timesteps, nx_c, ny_c)
+        E.g. the output of `combine_fields`; memory maps are fine.
+    n_sensors : int
+    rank : int, optional
+        Number of POD modes used for the selection, by default n_sensors.
+    oversampling : int
+        Extra singular triplets carried through the updates.
+    refresh_every : int
+        Number of incremental updates between exact recomputations.
+    dtype : working precision of the decompositions.
+    method : {"qr", "greedy"}
+        "qr" uses `qr_sensors`, "greedy" uses `greedy_sensors`, which is
+        cheaper on large grids and can place more sensors than modes.
+    mask : np.ndarray of bool, optional
+        Valid grid points, of shape (nx_c, ny_c) or (n_features,), e.g.
+        `StateLayout.valid`. By default the finite entries of the first
+        snapshot, so points that hold NaN (inside an obstacle, outside the
+        mesh) are dropped before every decomposition and never chosen.
+    """
+
+    def __init__(self, snapshots, n_sensors, rank=None, oversampling=10,
+                 refresh_every=50, dtype=np.float32, method="qr", mask=None):
+        if method not in _METHODS:
+            raise ValueError(f"method must be one of {sorted(_METHODS)}, got {method!r}")
+        self.grid_shape = snapshots.shape[1:]
+        self.snapshots = snapshots.reshape(snapshots.shape[0], -1)
+        self.n_sensors = n_sensors
+        self.rank = rank or n_sensors
+        self.refresh_every = refresh_every
+        self._place = _METHODS[method]
+
+        if mask is None:
+            mask = np.isfinite(self.snapshots[0])
+        mask = np.asarray(mask, dtype=bool).ravel()
+        # feature index of every column the decompositions see
+        self.features = None if mask.all() else np.flatnonzero(mask)
+        self._svd = WindowedSVD(self.snapshots, self.rank + oversampling, dtype=dtype,
+                                features=self.features)
+
+    def select_window(self):
+        """Feature indices of the sensors for the current window."""
+        sensors = self._place(self._svd.modes(self.rank), self.n_sensors)
+        return sensors if self.features is None else self.features[sensors]
+
+    def select(self, intervals, reconstructor=None):
+        """
+        Parameters
+        ----------
+        intervals : list of (start, end)
+        reconstructor : SparseReconstructor, optional
+            Gets the reconstruction operator of every interval fitted while
+            its POD basis is at hand, keyed by the (start, end) tuple. With a
+            mask, its layout must carry the same mask.
+
+        Returns
+        -------
+        list of np.ndarray of shape (n_sensors, 2)
+            Sensor coordinates (i, j) in the snapshot grid for every interval,
+            in the order of `intervals`; this is the `sensor_coords_list`
+            expected by `plot_all_intervals`.
+        """
+        sensor_coords_list = [None] * len(intervals)
+        window = None
+        n_updates = 0
+        for k in sorted(range(len(intervals)), key=lambda k: tuple(intervals[k])):
+            s, e = intervals[k]
+            # a window sharing fewer rows than the kept rank carries little
+            # over, and recomputing it is as cheap as the update
+            overlap = 0 if window is None else min(e, window[1]) - max(s, window[0])
+            if overlap >= self._svd.n_keep and n_updates < self.refresh_every:
+                self._svd.move_to(s, e)
+                n_updates += 1
+            else:
+                self._svd.refresh(range(s, e))
+                n_updates = 0
+            window = (s, e)
+            sensors = self.select_window()
+            if reconstructor is not None:
+                reconstructor.fit((s, e), self._svd.modes(self.rank), sensors)
+            sensor_coords_list[k] = np.stack(
+                np.unravel_index(sensors, self.grid_shape), axis=-1)
+        return sensor_coords_list
+
+
+def select_sensors_per_interval(snapshots, intervals, n_sensors, rank=None, **kwargs):
+    """Functional shortcut for `IntervalSensorSelector(...).select(intervals)`."""
+    return IntervalSensorSelector(snapshots, n_sensors, rank=rank, **kwargs).select(intervals)
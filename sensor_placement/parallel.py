@@ -0,0 +1,132 @@
+import mmap, os
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from thread_limits import limit_threads, thread_env
+
+from .interval_selection import IntervalSensorSelector
+
+# Snapshot tensor of the current worker process, attached once by `_init_worker`.
+_worker_snapshots = None
+_worker_shm = None
+
+
+def _init_worker(source, shape, dtype, blas_threads):
+    global _worker_snapshots, _worker_shm
+    limit_threads(blas_threads)
+
+    kind, location, offset = source
+    if kind == "memmap":
+        _worker_snapshots = np.memmap(location, dtype=dtype, mode="r",
+                                      shape=shape, offset=offset)
+    else:
+        # Spawned workers share the parent's resource tracker, so attaching
+        # here does not make the segment outlive or die with the worker.
+        _worker_shm = shared_memory.SharedMemory(name=location)
+        _worker_snapshots = np.ndarray(shape, dtype=dtype, buffer=_worker_shm.buf)
+
+
+def _select_batch(batch, n_sensors, kwargs):
+    selector = IntervalSensorSelector(_worker_snapshots, n_sensors, **kwargs)
+    return selector.select([interval for _, interval in batch])
+
+
+def _memmap_source(snapshots):
+    """(filename, offset) of a C-contiguous, file-backed array, else None."""
+    # The array that owns the mapping is the last one in the chain of views.
+    base = snapshots
+    while isinstance(base.base, np.ndarray):
+        base = base.base
+    if (not isinstance(base, np.memmap) or not isinstance(base.base, mmap.mmap)
+            or base.filename is None or not snapshots.flags.c_contiguous):
+        return None
+    # The view may start inside the mapping, e.g. a slice of an .npy file.
+    start = (snapshots.__array_interface__["data"][0]
+             - base.__array_interface__["data"][0])
+    return base.filename, base.offset + start
+
+
+def _batches(intervals, n_batches):
+    """
+    Split the intervals, sorted by start, into `n_batches` contiguous runs so
+    that every worker keeps the incremental updates between neighbouring
+    windows.
+    """
+    order = sorted(range(len(intervals)), key=lambda k: tuple(intervals[k]))
+    return [[(k, tuple(intervals[k])) for k in run]
+            for run in np.array_split(order, n_batches) if len(run)]
+
+
+def select_sensors_parallel(snapshots, intervals, n_sensors, rank=None,
+                            n_workers=None, blas_threads=1,
+                            batches_per_worker=1, **kwargs):
+    """
+    Parallel version of `select_sensors_per_interval`.
+
+    The intervals are sorted, cut into contiguous batches and handed to a
+    pool of worker processes, each running an `IntervalSensorSelector` on
+    its batch. The snapshot tensor is never pickled: memory maps (e.g.
+    `np.load(..., mmap_mode='r')` or `StateLayout.allocate(filename=...)`)
+    are reopened by file name in every worker, in-memory arrays are copied
+    once into a shared memory block that all workers read.
+
+    Parameters
+    ----------
+    snapshots : np.ndarray of shape (n_timesteps, nx_c, ny_c)
+    intervals : list of (start, end)
+    n_sensors : int
+    rank : int, optional
+        Number of POD modes used for the selection, by default n_sensors.
+    n_workers : int
+        Number of worker processes, by default cpu_count // blas_threads.
+    blas_threads : int
+        BLAS threads per worker, so that workers do not oversubscribe the
+        machine.
+    batches_per_worker : int
+        More batches balance the load better but restart the windowed SVD
+        more often.
+    **kwargs
+        Passed on to `IntervalSensorSelector` (oversampling, refresh_every,
+        dtype).
+
+    Returns
+    -------
+    list of np.ndarray of shape (n_sensors, 2)
+        Sensor coordinates for every interval, in the order of `intervals`.
+    """
+    if n_workers is None:
+        n_workers = max(1, (os.cpu_count() or 1) // blas_threads)
+    batches = _batches(intervals, n_workers * batches_per_worker)
+    kwargs = dict(kwargs, rank=rank)
+
+    shm = None
+    source = _memmap_source(snapshots)
+    if source is not None:
+        source = ("memmap", *source)
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=max(1, snapshots.nbytes))
+        np.ndarray(snapshots.shape, dtype=snapshots.dtype, buffer=shm.buf)[...] = snapshots
+        source = ("shm", shm.name, 0)
+
+    sensor_coords_list = [None] * len(intervals)
+    try:
+        with thread_env(blas_threads):
+            # spawn: forked workers would inherit the parent's BLAS thread pools
+            executor = ProcessPoolExecutor(
+                max_workers=min(n_workers, len(batches)) or 1,
+                mp_context=mp.get_context("spawn"), initializer=_init_worker,
+                initargs=(source, snapshots.shape, snapshots.dtype, blas_threads))
+            futures = [(batch, executor.submit(_select_batch, batch, n_sensors, kwargs))
+                       for batch in batches]
+        with executor:
+            for batch, future in futures:
+                for (k, _), coords in zip(batch, future.result()):
+                    sensor_coords_list[k] = coords
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+    return sensor_coords_list
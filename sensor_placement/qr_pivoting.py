@@ -0,0 +1,27 @@
+import numpy as np
+from scipy.linalg import qr
+
+
+def qr_sensors(modes, n_sensors):
+    """
+    Sensor locations by QR factorization with column pivoting of the POD basis.
+
+    Parameters
+    ----------
+    modes : np.ndarray of shape (n_features, rank)
+        Orthonormal spatial modes; every row is a candidate sensor location.
+    n_sensors : int
+        Number of sensors, at most `rank`.
+
+    Returns
+    -------
+    np.ndarray of shape (n_sensors,)
+        Feature indices of the sensors, in pivot order.
+    """
+    if n_sensors > modes.shape[1]:
+        raise ValueError(f"QR pivoting places at most rank={modes.shape[1]} sensors, "
+                         f"got n_sensors={n_sensors}")
+    # no overwrite_a: modes.T is Fortran-ordered whenever modes is C-ordered,
+    # and LAPACK would then factor the caller's basis in place
+    _, pivots = qr(modes.T, mode="r", pivoting=True, check_finite=False)
+    return pivots[:n_sensors]
@@ -0,0 +1,124 @@
+import numpy as np
+
+from state_concatenation import StateLayout
+
+
+class SparseReconstructor:
+    """
+    Full-state reconstruction from sparse sensor readings, x̂ = Ψ (Θ_S)⁺ y,
+    where Ψ (n_features, rank) is the POD basis of an interval and
+    Θ_S = Ψ[S] its rows at the sensors S.
+
+    The product D = ((Θ_S)⁺)ᵀ Ψᵀ of shape (n_sensors, n_features) is
+    precomputed once per interval, so reconstructing a batch of T
+    timesteps is a single (T, n_sensors) @ (n_sensors, n_features) matrix
+    product written straight into the snapshot matrix. With more sensors
+    than modes the operator is kept factored as ((Θ_S)⁺)ᵀ and Ψᵀ, which
+    costs rank instead of n_sensors multiply-adds per output value. The
+    product is bound by arithmetic, about 2 · rank · n_features flops per
+    snapshot (see `bench_reconstruction.py`). The fields are
+    returned as `StateLayout.split` views of it, i.e. the (T, nx, ny)
+    arrays `split_state` would produce, without copies. With a masked
+    layout the operator holds NaN in the columns of the invalid points, so
+    the same product writes NaN there and no scatter or fill pass follows.
+
+    Example
+    -------
+    >>> layout = StateLayout({"u": (nx, ny), "v": (nx, ny)})
+    >>> rec = SparseReconstructor(layout)
+    >>> coords = IntervalSensorSelector(X, 10).select(intervals, reconstructor=rec)
+    >>> Y = X.reshape(len(X), -1)[s:e][:, rec.sensors((s, e))]
+    >>> u_hat, v_hat = rec.reconstruct(Y, (s, e))
+    """
+
+    def __init__(self, layout, dtype=np.float32):
+        if not isinstance(layout, StateLayout):
+            layout = StateLayout({"u": tuple(layout), "v": tuple(layout)})
+        self.layout = layout
+        self.dtype = dtype
+        self._operators = {}
+        self._sensors = {}
+
+    def fit(self, key, modes, sensors):
+        """
+        Precompute the reconstruction operator of interval `key`.
+
+        Parameters
+        ----------
+        key : hashable, e.g. the (start, end) interval
+        modes : np.ndarray of shape (n_valid, rank)
+            Modes on the valid points of the layout (all points without a mask).
+        sensors : feature indices of shape (n_sensors,), or (n_sensors, 2)
+            coordinates in the combined grid as returned by
+            `IntervalSensorSelector.select`.
+        """
+        layout = self.layout
+        sensors = np.asarray(sensors)
+        if sensors.ndim == 2:
+            sensors = np.ravel_multi_index(tuple(sensors.T), layout.combined_shape)
+        modes = np.asarray(modes, dtype=np.float64)
+        if modes.shape[0] != layout.n_valid:
+            raise ValueError(f"modes have {modes.shape[0]} features, the layout "
+                             f"has {layout.n_valid} valid ones")
+        rows = sensors
+        if layout.valid is not None:
+            if not layout.valid[sensors].all():
+                raise ValueError("sensors must lie on valid points of the layout")
+            rows = np.searchsorted(layout.valid_features, sensors)
+        theta_pinv = np.linalg.pinv(modes[rows])                 # (rank, n_sensors)
+        left = None
+        if len(sensors) > modes.shape[1]:
+            left = np.ascontiguousarray(theta_pinv.T, dtype=self.dtype)
+            right = modes.T
+        else:
+            right = (modes @ theta_pinv).T
+        self._operators[key] = (left, self._full_width(right))
+        self._sensors[key] = sensors
+        return self
+
+    def _full_width(self, right):
+        """(k, n_valid) -> C-contiguous (k, n_features) with NaN columns at invalid points."""
+        layout = self.layout
+        if layout.valid is None:
+            return np.ascontiguousarray(right, dtype=self.dtype)
+        full = np.full((len(right), layout.n_features), np.nan, dtype=self.dtype)
+        full[:, layout.valid_features] = right
+        return full
+
+    def __contains__(self, key):
+        return key in self._operators
+
+    def operator(self, key):
+        """(n_sensors, n_features) operator D of interval `key`, NaN at invalid points."""
+        left, right = self._operators[key]
+        return right if left is None else left @ right
+
+    def sensors(self, key):
+        """Feature indices whose readings `reconstruct` expects, in column order."""
+        return self._sensors[key]
+
+    def reconstruct(self, readings, key, out=None):
+        """
+        Reconstruct every timestep of `readings` with the operator of `key`.
+
+        Parameters
+        ----------
+        readings : np.ndarray of shape (T, n_sensors)
+            Sensor values in the order of `sensors(key)`.
+        out : np.ndarray of shape (T, n_features), optional
+            Snapshot matrix to write into, e.g. a slice of a matrix from
+            `layout.allocate` covering the whole trajectory.
+
+        Returns
+        -------
+        tuple of np.ndarray of shape (T, nx, ny)
+            One view into `out` per field of the layout.
+        """
+        left, right = self._operators[key]
+        readings = np.asarray(readings, dtype=right.dtype)
+        if left is not None:
+            readings = readings @ left                          # (T, rank) coefficients
+        if out is None:
+            out = self.layout.allocate(len(readings), dtype=right.dtype)
+        np.matmul(readings, right, out=out)
+        return self.layout.split(out)
@@ -0,0 +1,39 @@
+import numpy as np
+
+from sensor_placement import greedy_sensors
+
+
+def _modes(n_features=300, rank=8, seed=0):
+    rng = np.random.default_rng(seed)
+    modes, _ = np.linalg.qr(rng.standard_normal((n_features, rank)))
+    return modes
+
+
+def _logdet(modes, sensors, delta):
+    Psi = modes[sensors]
+    return np.linalg.slogdet(delta * np.eye(modes.shape[1]) + Psi.T @ Psi)[1]
+
+
+def _plain_greedy(modes, n_sensors, delta):
+    chosen = []
+    for _ in range(n_sensors):
+        gains = [_logdet(modes, chosen + [i], delta) if i not in chosen else -np.inf
+                 for i in range(len(modes))]
+        chosen.append(int(np.argmax(gains)))
+    return chosen
+
+
+def test_matches_plain_greedy():
+    modes = _modes()
+    delta = 1e-6 * np.mean(np.sum(modes ** 2, axis=1))
+    for n_sensors, block_size in ((5, 64), (12, 4)):
+        sensors = greedy_sensors(modes, n_sensors, block_size=block_size)
+        np.testing.assert_array_equal(sensors, _plain_greedy(modes, n_sensors, delta))
+
+
+def test_more_sensors_than_modes():
+    modes = _modes()
+    sensors = greedy_sensors(modes, 20)
+    assert len(set(sensors.tolist())) == 20
+    # the first `rank` sensors make the sensor rows well conditioned
+    assert np.linalg.matrix_rank(modes[sensors[:8]]) == 8
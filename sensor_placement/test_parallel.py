@@ -0,0 +1,46 @@
+import numpy as np
+
+from sensor_placement import select_sensors_parallel, select_sensors_per_interval
+from sensor_placement.parallel import _memmap_source
+
+
+def _snapshots(n_timesteps=160, rank=6, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n_timesteps, rank)) @ rng.standard_normal((rank, 20 * 15))
+    return X.reshape(-1, 20, 15)
+
+
+# deliberately out of order: results must come back in the order given
+INTERVALS = [(60, 110), (0, 50), (100, 150), (20, 70), (40, 90), (80, 130)]
+
+
+def _assert_same(sensors, reference):
+    assert len(sensors) == len(reference)
+    for a, b in zip(sensors, reference):
+        assert a.shape == (6, 2)
+        np.testing.assert_array_equal(np.sort(a, axis=0), np.sort(b, axis=0))
+
+
+def test_in_memory_matches_serial():
+    snapshots = _snapshots()
+    reference = select_sensors_per_interval(snapshots, INTERVALS, 6, dtype=np.float64)
+    sensors = select_sensors_parallel(snapshots, INTERVALS, 6, n_workers=2,
+                                      batches_per_worker=2, dtype=np.float64)
+    _assert_same(sensors, reference)
+
+
+def test_sliced_memmap_matches_serial(tmp_path):
+    snapshots = _snapshots()
+    np.save(tmp_path / "snapshots.npy", snapshots)
+    mapped = np.load(tmp_path / "snapshots.npy", mmap_mode="r")[10:]
+
+    # the slice starts 10 snapshots into the mapping, behind the .npy header
+    filename, offset = _memmap_source(mapped)
+    assert offset == mapped.base.offset + 10 * snapshots[0].nbytes
+    # non-contiguous views cannot be reopened by file name
+    assert _memmap_source(mapped[:, ::2]) is None
+
+    intervals = [(s - 10, e - 10) for s, e in INTERVALS if s >= 10]
+    reference = select_sensors_per_interval(snapshots[10:], intervals, 6, dtype=np.float64)
+    sensors = select_sensors_parallel(mapped, intervals, 6, n_workers=2, dtype=np.float64)
+    _assert_same(sensors, reference)
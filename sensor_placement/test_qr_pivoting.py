@@ -0,0 +1,28 @@
+import numpy as np
+
+from sensor_placement import IntervalSensorSelector, SparseReconstructor, qr_sensors
+from state_concatenation import StateLayout
+
+
+def test_modes_unchanged():
+    rng = np.random.default_rng(0)
+    modes, _ = np.linalg.qr(rng.standard_normal((300, 8)))
+    modes = np.ascontiguousarray(modes)         # modes.T is Fortran-ordered
+    before = modes.copy()
+    sensors = qr_sensors(modes, 8)
+    np.testing.assert_array_equal(modes, before)
+    assert len(np.unique(sensors)) == 8
+
+
+def test_selector_without_oversampling_keeps_window_basis():
+    # the second interval is an update of the first window's basis
+    rng = np.random.default_rng(1)
+    X = rng.standard_normal((120, 6)) @ rng.standard_normal((6, 400))
+    intervals = [(0, 100), (10, 100)]
+    rec = SparseReconstructor(StateLayout({"u": (20, 20)}), dtype=np.float64)
+    IntervalSensorSelector(X.reshape(-1, 20, 20), 6, oversampling=0,
+                           dtype=np.float64).select(intervals, reconstructor=rec)
+    for s, e in intervals:
+        readings = X[s:e, rec.sensors((s, e))]
+        u, = rec.reconstruct(readings, (s, e))
+        np.testing.assert_allclose(u.reshape(e - s, -1), X[s:e], atol=1e-8)
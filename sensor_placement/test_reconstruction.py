@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from sensor_placement import IntervalSensorSelector, SparseReconstructor
+from state_concatenation import StateLayout
+
+NX, NY = 10, 12
+
+
+def _low_rank(layout, n_timesteps=40, rank=6, seed=0):
+    rng = np.random.default_rng(seed)
+    modes, _ = np.linalg.qr(rng.standard_normal((layout.n_valid, rank)))
+    return modes, rng.standard_normal((n_timesteps, rank)) @ modes.T
+
+
+@pytest.mark.parametrize("n_sensors", [6, 15])
+def test_exact_on_the_modes(n_sensors):
+    layout = StateLayout({"u": (NX, NY), "v": (NX, NY)})
+    modes, X = _low_rank(layout)
+    sensors = np.random.default_rng(1).choice(layout.n_features, n_sensors, replace=False)
+    rec = SparseReconstructor(layout, dtype=np.float64).fit("a", modes, sensors)
+    assert "a" in rec and rec.operator("a").shape == (n_sensors, layout.n_features)
+
+    out = layout.allocate(len(X), dtype=np.float64)
+    u, v = rec.reconstruct(X[:, sensors], "a", out=out)
+    assert np.shares_memory(u, out) and u.shape == (len(X), NX, NY)
+    np.testing.assert_allclose(out, X, atol=1e-10)
+
+
+def test_masked_layout():
+    mask = np.ones((NX, NY), dtype=bool)
+    mask[3:6, 4:8] = False
+    layout = StateLayout({"u": (NX, NY), "v": (NX, NY)}, mask=mask)
+    modes, X_valid = _low_rank(layout)
+    sensors = layout.valid_features[::17]
+    rec = SparseReconstructor(layout, dtype=np.float64).fit(0, modes, sensors)
+    u, v = rec.reconstruct(X_valid[:, ::17], 0)
+    assert np.isnan(u[:, ~mask]).all() and np.isnan(v[:, ~mask]).all()
+    X = layout.assemble([u, v])
+    np.testing.assert_allclose(layout.compress(X), X_valid, atol=1e-10)
+
+    with pytest.raises(ValueError):
+        rec.fit(1, modes, [layout.ravel_index(0, 4, 5)])
+
+
+def test_fitted_by_the_selector():
+    layout = StateLayout({"u": (NX, NY), "v": (NX, NY)})
+    _, X = _low_rank(layout, n_timesteps=90)
+    snapshots = layout.combined(X)
+    intervals = [(0, 50), (40, 90)]
+    rec = SparseReconstructor(layout)
+    coords = IntervalSensorSelector(snapshots, 6).select(intervals, reconstructor=rec)
+    for (s, e), sensor_coords in zip(intervals, coords):
+        sensors = rec.sensors((s, e))
+        np.testing.assert_array_equal(layout.to_combined(sensors), sensor_coords)
+        u, v = rec.reconstruct(X[s:e][:, sensors], (s, e))
+        np.testing.assert_allclose(layout.assemble([u, v]), X[s:e], atol=1e-4)
@@ -0,0 +1,54 @@
+import numpy as np
+
+from sensor_placement import IntervalSensorSelector, WindowedSVD
+
+
+def _low_rank(n_timesteps=250, n_features=400, rank=6, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((n_timesteps, rank)) @ rng.standard_normal((rank, n_features))
+
+
+def _assert_matches_window(svd, X, start, stop):
+    S = np.linalg.svd(X[start:stop], compute_uv=False)[:len(svd.S)]
+    np.testing.assert_allclose(svd.S, S, rtol=1e-8, atol=1e-8 * S[0])
+    np.testing.assert_allclose((svd.U * svd.S) @ svd.V.T, X[start:stop].T, atol=1e-8)
+
+
+def test_move_to_matches_recomputed_svd():
+    X = _low_rank()
+    svd = WindowedSVD(X, n_keep=10, dtype=np.float64)
+    svd.refresh(range(0, 40))
+    svd.move_to(10, 60)
+    _assert_matches_window(svd, X, 10, 60)
+
+
+def test_remove_more_rows_than_rank():
+    # fewer rows are left (3) than singular values are kept (6)
+    X = _low_rank()
+    svd = WindowedSVD(X, n_keep=10, dtype=np.float64)
+    svd.refresh(range(0, 40))
+    svd.remove(range(0, 37))
+    assert svd.U.shape[1] == len(svd.S) == svd.V.shape[1] == 3
+    svd.add(range(40, 75))
+    _assert_matches_window(svd, X, 37, 75)
+
+
+def test_selector_small_overlaps():
+    snapshots = _low_rank(rank=30).reshape(-1, 20, 20)
+    intervals = [(s, s + 40) for s in range(0, 200, 35)]
+    sensors = IntervalSensorSelector(snapshots, 8).select(intervals)
+    reference = IntervalSensorSelector(snapshots, 8, refresh_every=0).select(intervals)
+    assert len(sensors) == len(intervals)
+    for a, b in zip(sensors, reference):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_selector_sliding_window_matches_refresh():
+    snapshots = _low_rank().reshape(-1, 20, 20)
+    intervals = [(s, s + 60) for s in range(0, 180, 20)]
+    sensors = IntervalSensorSelector(snapshots, 6, dtype=np.float64).select(intervals)
+    reference = IntervalSensorSelector(snapshots, 6, dtype=np.float64,
+                                       refresh_every=0).select(intervals)
+    for a, b in zip(sensors, reference):
+        assert a.shape == (6, 2)
+        np.testing.assert_array_equal(np.sort(a, axis=0), np.sort(b, axis=0))
@@ -0,0 +1,87 @@
+import numpy as np
+
+from pod_basis import svd_append
+
+
+class WindowedSVD:
+    """
+    Truncated thin SVD of a sliding window of snapshots, Xᵂᵀ ≈ U diag(S) Vᵀ,
+    where the columns of Xᵂᵀ are the snapshots of the window.
+
+    Snapshots enter the window through a block Brand update and leave it
+    through a QR downdate of V, so moving a window by b rows costs
+    O(n_features · k · (k + b)) instead of a new SVD of the whole window.
+    Rows are tracked by their time index, so windows may move by arbitrary
+    amounts and grow or shrink at either end.
+
+    Information truncated away cannot be recovered by later downdates, so
+    `n_keep` should exceed the rank actually used; callers recompute the
+    window periodically to bound the drift (see `refresh`).
+    """
+
+    def __init__(self, snapshots, n_keep, dtype=np.float32, features=None):
+        self.snapshots = snapshots            # (n_timesteps, n_features)
+        self.n_keep = n_keep
+        self.dtype = dtype
+        # columns of the snapshots that take part, e.g. the valid points of
+        # a masked grid; the modes live on these columns only
+        self.features = features
+        self.times = []
+        self.U = self.S = self.V = None
+
+    def _rows(self, times):
+        rows = np.asarray(self.snapshots[times], dtype=self.dtype)
+        return rows if self.features is None else rows[:, self.features]
+
+    def refresh(self, times):
+        """Recompute the SVD of the window made of `times` from scratch."""
+        self.times = list(times)
+        X = self._rows(self.times)
+        V, S, Ut = np.linalg.svd(X, full_matrices=False)
+        keep = min(self.n_keep, len(S))
+        self.U, self.S, self.V = Ut[:keep].T, S[:keep], V[:, :keep]
+
+    def add(self, times):
+        """Append the snapshots at `times` to the window (block Brand update)."""
+        times = list(times)
+        if not times:
+            return
+        C = self._rows(times).T                   # (n_features, b)
+        U, S_k, W = svd_append(self.U, self.S, C)
+
+        k, b = len(self.S), len(times)
+        V = np.zeros((len(self.times) + b, k + b), dtype=self.dtype)
+        V[:len(self.times), :k] = self.V
+        V[len(self.times):, k:] = np.eye(b, dtype=self.dtype)
+
+        keep = min(self.n_keep, len(S_k))
+        self.U = U[:, :keep]
+        self.S = S_k[:keep]
+        self.V = V @ W[:, :keep]
+        self.times += times
+
+    def remove(self, times):
+        """Drop the snapshots at `times` from the window (QR downdate of V)."""
+        drop = set(times)
+        if not drop:
+            return
+        rows = [r for r, t in enumerate(self.times) if t not in drop]
+        # Xᵂᵀ without those columns is U diag(S) Wᵀ with W = V[rows]
+        Q_w, R_w = np.linalg.qr(self.V[rows])
+        # with fewer rows left than singular values the rank drops to
+        # len(rows); U, S and V must shrink together
+        U_c, S_c, V_ct = np.linalg.svd(self.S[:, None] * R_w.T, full_matrices=False)
+        self.U = self.U @ U_c
+        self.S = S_c
+        self.V = Q_w @ V_ct.T
+        self.times = [self.times[r] for r in rows]
+
+    def move_to(self, start, stop):
+        """Update the window to cover snapshots start..stop-1."""
+        current = set(self.times)
+        self.remove([t for t in self.times if not start <= t < stop])
+        self.add([t for t in range(start, stop) if t not in current])
+
+    def modes(self, rank):
+        """Leading `rank` spatial modes of the window, shape (n_features, rank)."""
+        return self.U[:, :rank]
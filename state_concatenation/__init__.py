@@ -1,9 +1,11 @@
 from .combine_state import combine_fields
 from .map_sensor_to_original import map_sensor_to_original
 from .split_state import split_state
+from .state_layout import StateLayout
 
 __all__ = [
     "combine_fields",
     "map_sensor_to_original",
-    "split_state"
+    "split_state",
+    "StateLayout"
 ]
\ No newline at end of file
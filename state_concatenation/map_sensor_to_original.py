@@ -1,16 +1,25 @@
-def map_sensor_to_original(sensor_coords, combined_shape, horizontal_concat=True):
+import numpy as np
+
+
+def map_sensor_to_original(sensor_coords, combined_shape, horizontal_concat=True,
+                           return_component=False):
     """
     Map sensor coordinates from a combined (augmented) domain back to the original domain.
     
     Parameters:
       sensor_coords : Each row is a coordinate [i, j] in the combined domain.
+          A batch of layouts of shape (n_layouts, n_sensors, 2) is mapped in one call.
       combined_shape : The shape (n_rows, n_cols) of the combined data.
           For horizontal concatenation, this should be (nx, 2*ny_orig).
           For vertical concatenation, this should be (2*nx_orig, ny).
-      mode : 'horizontal' or 'vertical'. Default is 'horizontal'.
+      horizontal_concat : True for horizontal, False for vertical concatenation.
+      return_component : Also return which field each sensor came from.
     
     Returns:
-      mapped_coords : The sensor coordinates mapped back to the original grid.
+      mapped_coords : The sensor coordinates mapped back to the original grid,
+          same shape as sensor_coords.
+      component : Only if return_component. Integer label per sensor,
+          0 for u and 1 for v, of shape sensor_coords.shape[:-1].
           
     Explanation:
       - In horizontal mode, if a sensor’s column index j is ≥ ny_orig,
@@ -18,22 +27,17 @@ def map_sensor_to_original(sensor_coords, combined_shape, horizontal_concat=True
       - In vertical mode, if a sensor’s row index i is ≥ nx_orig,
         then its original row index is i - nx_orig (while the column index stays the same).
     """
-    mapped_coords = sensor_coords.copy() 
-    
-    if horizontal_concat:
-        # combined_shape[1] is 2 * ny_orig.
-        ny_combined = combined_shape[1]
-        ny_orig = ny_combined // 2
-        for idx, (i, j) in enumerate(sensor_coords):
-            if j >= ny_orig:
-                mapped_coords[idx, 1] = j - ny_orig
-            # else: keep the same
-    else:
-        # combined_shape[0] is 2 * nx_orig.
-        nx_combined = combined_shape[0]
-        nx_orig = nx_combined // 2
-        for idx, (i, j) in enumerate(sensor_coords):
-            if i >= nx_orig:
-                mapped_coords[idx, 0] = i - nx_orig
-    
-    return mapped_coords
\ No newline at end of file
+    sensor_coords = np.asarray(sensor_coords)
+    mapped_coords = sensor_coords.copy()
+
+    # horizontal: the v block starts at column ny_orig = combined_shape[1] // 2
+    # vertical:   the v block starts at row    nx_orig = combined_shape[0] // 2
+    axis = 1 if horizontal_concat else 0
+    n_orig = combined_shape[axis] // 2
+    in_v = sensor_coords[..., axis] >= n_orig
+    # offset in the coordinates' dtype; an int8 label times n_orig overflows
+    mapped_coords[..., axis] -= np.where(in_v, n_orig, 0).astype(mapped_coords.dtype)
+
+    if return_component:
+        return mapped_coords, in_v.astype(np.int8)
+    return mapped_coords
@@ -0,0 +1,169 @@
+import numpy as np
+
+
+class StateLayout:
+    """
+    Placement of N fields (u, v, pressure, vorticity, ...) in one snapshot
+    matrix X of shape (n_timesteps, n_features).
+
+    The fields are concatenated exactly like `combine_fields` does for u and
+    v: side by side along y with `horizontal_concat` (combined grid
+    (nx, Σ ny_k), all fields share nx), otherwise stacked along x (combined
+    grid (Σ nx_k, ny), all fields share ny). A row of X is the combined grid
+    flattened in C order, so `X.reshape(-1, *combined_shape)` is the
+    `combine_fields` output.
+
+    Fields are written straight into X (one copy per field, no
+    concatenation temporaries) and read back as zero-copy views.
+
+    An optional validity `mask` marks the grid points that carry data, e.g.
+    the fluid points of a grid laid over a mesh with an obstacle (the
+    others hold NaN). It is either one (nx, ny) array shared by every
+    field, one array per field, or a flat (n_features,) array. `compress`
+    drops the invalid columns of X before a decomposition and `expand`
+    reinserts them as NaN on output.
+
+    Example
+    -------
+    >>> layout = StateLayout({"u": (nx, ny), "v": (nx, ny)})
+    >>> X = layout.assemble([u_field, v_field])   # (T, 2*nx*ny)
+    >>> u, v = layout.split(X)                    # views into X
+    """
+
+    def __init__(self, fields, horizontal_concat=True, mask=None):
+        items = list(fields.items()) if isinstance(fields, dict) else list(fields)
+        if not items:
+            raise ValueError("a layout needs at least one field")
+        self.names = [name for name, _ in items]
+        self.shapes = [tuple(int(n) for n in shape) for _, shape in items]
+        self.horizontal_concat = horizontal_concat
+
+        shared = 0 if horizontal_concat else 1
+        if len({shape[shared] for shape in self.shapes}) != 1:
+            raise ValueError(f"all fields need the same {'nx' if shared == 0 else 'ny'} "
+                             f"for {'horizontal' if horizontal_concat else 'vertical'} "
+                             f"concatenation, got {self.shapes}")
+
+        # start of every field along the concatenation axis of the combined grid
+        extents = [shape[1 - shared] for shape in self.shapes]
+        self._starts = np.concatenate(([0], np.cumsum(extents)))
+        if horizontal_concat:
+            self.combined_shape = (self.shapes[0][0], int(self._starts[-1]))
+        else:
+            self.combined_shape = (int(self._starts[-1]), self.shapes[0][1])
+        self.n_features = self.combined_shape[0] * self.combined_shape[1]
+        self.valid = None if mask is None else self._flat_mask(mask)
+        # feature indices of the valid points, i.e. the columns kept by `compress`
+        self.valid_features = None if self.valid is None else np.flatnonzero(self.valid)
+        self.n_valid = self.n_features if self.valid is None else len(self.valid_features)
+
+    @classmethod
+    def masked_like(cls, fields, X, horizontal_concat=True):
+        """Layout whose mask keeps the finite entries of the first snapshot of X."""
+        return cls(fields, horizontal_concat, mask=np.isfinite(X[0]).ravel())
+
+    def _flat_mask(self, mask):
+        if not isinstance(mask, (list, tuple)):
+            mask = np.asarray(mask, dtype=bool)
+            if mask.shape == (self.n_features,):
+                return mask
+            if mask.shape == self.combined_shape:
+                return mask.ravel()
+            mask = [mask] * len(self.names)
+        valid = np.empty(self.combined_shape, dtype=bool)
+        for k, field_mask in enumerate(mask):
+            self.field_view(valid[None], k)[0] = field_mask
+        return valid.ravel()
+
+    def _field_index(self, field):
+        return self.names.index(field) if isinstance(field, str) else int(field)
+
+    def allocate(self, n_timesteps, dtype=np.float32, filename=None):
+        """
+        Empty snapshot matrix, in memory or as an .npy memory map at `filename`.
+        With a mask the invalid columns are NaN from the start, so writers
+        only need to fill the valid ones.
+        """
+        shape = (n_timesteps, self.n_features)
+        if filename is None:
+            X = np.empty(shape, dtype=dtype)
+        else:
+            X = np.lib.format.open_memmap(filename, mode="w+", dtype=dtype, shape=shape)
+        if self.valid is not None and np.issubdtype(X.dtype, np.inexact):
+            X[:, ~self.valid] = np.nan
+        return X
+
+    def combined(self, X):
+        """View X as (n_timesteps, *combined_shape), the `combine_fields` layout."""
+        return X.reshape(X.shape[0], *self.combined_shape)
+
+    def field_view(self, X, field):
+        """Zero-copy (n_timesteps, nx, ny) view of one field inside X."""
+        k = self._field_index(field)
+        start, stop = self._starts[k], self._starts[k + 1]
+        if self.horizontal_concat:
+            return self.combined(X)[:, :, start:stop]
+        return self.combined(X)[:, start:stop, :]
+
+    def split(self, X):
+        """Views of every field inside X, in layout order."""
+        return tuple(self.field_view(X, k) for k in range(len(self.names)))
+
+    def assemble(self, fields, out=None, dtype=None):
+        """
+        Write `fields` (arrays of shape (n_timesteps, nx_k, ny_k), in layout
+        order) into `out`, or into a newly allocated snapshot matrix.
+        """
+        if len(fields) != len(self.names):
+            raise ValueError(f"expected {len(self.names)} fields, got {len(fields)}")
+        if out is None:
+            out = self.allocate(len(fields[0]), dtype=dtype or np.result_type(*fields))
+        for k, field in enumerate(fields):
+            if field.shape[1:] != self.shapes[k]:
+                raise ValueError(f"field {self.names[k]!r} has shape {field.shape[1:]}, "
+                                 f"expected {self.shapes[k]}")
+            self.field_view(out, k)[...] = field
+        return out
+
+    def ravel_index(self, field, i, j):
+        """Flat feature index of grid point (i, j) of `field` (vectorized over i, j)."""
+        start = self._starts[self._field_index(field)]
+        i, j = np.asarray(i), np.asarray(j)
+        n_cols = self.combined_shape[1]
+        if self.horizontal_concat:
+            return i * n_cols + start + j
+        return (start + i) * n_cols + j
+
+    def unravel_index(self, flat):
+        """Inverse of `ravel_index`: (field index, i, j) arrays for flat feature indices."""
+        row, col = np.divmod(np.asarray(flat), self.combined_shape[1])
+        along = col if self.horizontal_concat else row
+        field = np.searchsorted(self._starts, along, side="right") - 1
+        offset = along - self._starts[field]
+        if self.horizontal_concat:
+            return field, row, offset
+        return field, offset, col
+
+    def to_combined(self, flat):
+        """(i, j) coordinates in the combined grid, as used by `map_sensor_to_original`."""
+        return np.stack(np.divmod(np.asarray(flat), self.combined_shape[1]), axis=-1)
+
+    def compress(self, X):
+        """Columns of X at the valid points, (n_timesteps, n_valid); X itself without a mask."""
+        if self.valid is None:
+            return X
+        return np.asarray(X)[:, self.valid_features]
+
+    def expand(self, X_valid, out=None):
+        """Inverse of `compress`: full snapshot matrix with NaN at invalid points."""
+        if self.valid is None:
+            if out is None:
+                return X_valid
+            out[...] = X_valid
+            return out
+        if out is None:
+            out = self.allocate(len(X_valid), dtype=X_valid.dtype)
+        else:
+            out[:, ~self.valid] = np.nan
+        out[:, self.valid_features] = X_valid
+        return out
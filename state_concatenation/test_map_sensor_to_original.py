@@ -0,0 +1,19 @@
+import numpy as np
+
+from state_concatenation import map_sensor_to_original
+
+
+def test_horizontal_large_grid():
+    # n_orig = 400 does not fit into the int8 component label
+    coords, component = map_sensor_to_original(np.array([[0, 10], [1, 300], [2, 799]]),
+                                               (50, 800), return_component=True)
+    np.testing.assert_array_equal(coords, [[0, 10], [1, 300], [2, 399]])
+    np.testing.assert_array_equal(component, [0, 0, 1])
+    assert component.dtype == np.int8
+
+
+def test_vertical_batch():
+    coords = np.array([[[0, 5], [700, 5]], [[659, 1], [660, 2]]])
+    mapped = map_sensor_to_original(coords, (2 * 660, 123), horizontal_concat=False)
+    np.testing.assert_array_equal(mapped, [[[0, 5], [40, 5]], [[659, 1], [0, 2]]])
+    assert mapped.dtype == coords.dtype
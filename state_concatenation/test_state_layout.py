@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from state_concatenation import StateLayout, combine_fields, map_sensor_to_original
+
+
+def _fields(nx=5, ny=4, n_timesteps=3, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((n_timesteps, nx, ny)), rng.standard_normal((n_timesteps, nx, ny))
+
+
+@pytest.mark.parametrize("horizontal_concat", [True, False])
+def test_assemble_matches_combine_fields(horizontal_concat):
+    u, v = _fields()
+    layout = StateLayout({"u": u.shape[1:], "v": v.shape[1:]}, horizontal_concat)
+    X = layout.assemble([u, v])
+    np.testing.assert_array_equal(layout.combined(X), combine_fields(u, v, horizontal_concat))
+    u_view, v_view = layout.split(X)
+    np.testing.assert_array_equal(u_view, u)
+    np.testing.assert_array_equal(v_view, v)
+    assert np.shares_memory(u_view, X)
+
+
+@pytest.mark.parametrize("horizontal_concat", [True, False])
+def test_index_round_trip(horizontal_concat):
+    layout = StateLayout({"u": (5, 4), "v": (5, 4)}, horizontal_concat)
+    flat = np.arange(layout.n_features)
+    field, i, j = layout.unravel_index(flat)
+    np.testing.assert_array_equal(layout.ravel_index(0, i[field == 0], j[field == 0]),
+                                  flat[field == 0])
+    np.testing.assert_array_equal(layout.ravel_index("v", i[field == 1], j[field == 1]),
+                                  flat[field == 1])
+    mapped, component = map_sensor_to_original(layout.to_combined(flat), layout.combined_shape,
+                                               horizontal_concat, return_component=True)
+    np.testing.assert_array_equal(component, field)
+    np.testing.assert_array_equal(mapped, np.stack([i, j], axis=-1))
+
+
+def test_mask_compress_expand():
+    u, v = _fields()
+    mask = np.ones(u.shape[1:], dtype=bool)
+    mask[1:3, 1:3] = False
+    u[:, ~mask] = v[:, ~mask] = np.nan
+    layout = StateLayout.masked_like({"u": u.shape[1:], "v": v.shape[1:]},
+                                     combine_fields(u, v).reshape(len(u), -1))
+    assert layout.n_valid == 2 * mask.sum()
+    X = layout.assemble([u, v])
+    X_valid = layout.compress(X)
+    assert X_valid.shape == (len(u), layout.n_valid)
+    assert np.isfinite(X_valid).all()
+    np.testing.assert_array_equal(layout.expand(X_valid), X)
+
+    empty = layout.allocate(2)
+    assert np.isnan(empty[:, ~layout.valid]).all()
+
+
+def test_mismatched_fields():
+    with pytest.raises(ValueError):
+        StateLayout({"u": (5, 4), "v": (6, 4)})
+    layout = StateLayout({"u": (5, 4), "v": (5, 4)})
+    u, v = _fields()
+    with pytest.raises(ValueError):
+        layout.assemble([u, v[:, :, :3]])
@@ -0,0 +1,7 @@
+from .thread_env import THREAD_ENV_VARS, limit_threads, thread_env
+
+__all__ = [
+    "THREAD_ENV_VARS",
+    "limit_threads",
+    "thread_env"
+]
\ No newline at end of file
@@ -0,0 +1,41 @@
+import os
+from contextlib import contextmanager
+
+# BLAS/OpenMP pools (FFTW through OpenMP, and the BLAS used by numpy) that
+# would otherwise size themselves to the whole machine in every worker.
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS",
+                   "MKL_NUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+
+@contextmanager
+def thread_env(n_threads):
+    """
+    Set the thread-count variables while a pool spawns its workers.
+    OpenBLAS and MKL read them when numpy is first imported, which in a
+    spawned worker happens before the initializer runs, so setting them in
+    the initializer is too late. Workers are started on submit, so the
+    submissions belong inside the block as well.
+    """
+    saved = {var: os.environ.get(var) for var in THREAD_ENV_VARS}
+    os.environ.update({var: str(n_threads) for var in THREAD_ENV_VARS})
+    try:
+        yield
+    finally:
+        for var, value in saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+
+
+def limit_threads(n_threads):
+    """
+    Limit the thread pools of the running process with threadpoolctl, if
+    it is installed. Use as worker initializer next to `thread_env`, or in
+    processes that are already running (e.g. MPI ranks).
+    """
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    threadpool_limits(n_threads)